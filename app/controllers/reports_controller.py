@@ -1,17 +1,33 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends, Response
+import base64
 
-from app.entities.report import ReportFilters, ReportInDTO, ReportInfoOutDTO
+from fastapi import APIRouter, UploadFile, File, Form, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+
+from app.entities.municipality import MunicipalityDatasetOutDTO, MunicipalityLookupOutDTO
+from app.entities.report import ReportFilters, ReportInDTO, ReportInfoOutDTO, ExportFormat
+from app.services.export_profissionais_service import ExportProfissionaisService
+from app.services.generate_report_service import GenerateReportService
+from app.services.generate_reports_batch_service import GenerateReportsBatchService
 from app.services.get_report_info_service import GetReportInfoService
 from app.services.get_report_file_pdf_service import GetReportFilePdfService
+from app.services.lookup_municipality_service import LookupMunicipalityService
+from app.services.register_municipality_dataset_service import RegisterMunicipalityDatasetService
 from app.utils.auth import get_current_user
+from app.utils.rate_limit import AdmissionTicket, admission_control, rate_limit
+from app.utils.responses import ReportJSONResponse
 
 router = APIRouter(
     prefix='/reports',
-    dependencies=[Depends(get_current_user)]  # ✅ Protege todas as rotas deste router
+    dependencies=[Depends(get_current_user), Depends(rate_limit)]  # ✅ Protege todas as rotas deste router
 )
 
 get_report_info_service = GetReportInfoService()
 get_report_file_pdf_service = GetReportFilePdfService()
+export_profissionais_service = ExportProfissionaisService()
+generate_report_service = GenerateReportService()
+generate_reports_batch_service = GenerateReportsBatchService()
+register_municipality_dataset_service = RegisterMunicipalityDatasetService()
+lookup_municipality_service = LookupMunicipalityService()
 
 
 def get_report_filter(
@@ -21,17 +37,82 @@ def get_report_filter(
     return ReportFilters(type=filter_type, value=value)
 
 
-@router.post('/info')
-async def get_report_info(
+def get_report_batch_filters(
+        filter_type: str = Form(...),
+        values: list[str] = Form(...)
+) -> list[ReportFilters]:
+    return [ReportFilters(type=filter_type, value=value) for value in values]
+
+
+@router.post('/info', dependencies=[Depends(admission_control)], response_model=ReportInfoOutDTO,
+             response_class=ReportJSONResponse)
+def get_report_info(
         file: UploadFile = File(...),
         filters: ReportFilters = Depends(get_report_filter),
-) -> ReportInfoOutDTO:
-    return get_report_info_service.execute(ReportInDTO(file=file, filters=filters))
+):
+    return ReportJSONResponse(get_report_info_service.execute(ReportInDTO(file=file, filters=filters)))
 
 
-@router.post('/pdf')
-async def get_report_pdf(
+@router.post('/pdf', dependencies=[Depends(admission_control)])
+def get_report_pdf(
         report_info: ReportInfoOutDTO,
 ):
     pdf_bytes = get_report_file_pdf_service.execute(report_info)
     return Response(content=pdf_bytes, media_type="application/pdf")
+
+
+@router.post('/generate', dependencies=[Depends(admission_control)])
+def generate_report(
+        file: UploadFile = File(...),
+        filters: ReportFilters = Depends(get_report_filter),
+        include_json: bool = Form(False),
+):
+    report_info, pdf_bytes = generate_report_service.execute(ReportInDTO(file=file, filters=filters))
+    if include_json:
+        return ReportJSONResponse({
+            'report': report_info,
+            'pdf': base64.b64encode(pdf_bytes).decode('ascii'),
+        })
+    return Response(content=pdf_bytes, media_type="application/pdf")
+
+
+@router.post('/export/profissionais')
+def export_profissionais(
+        file: UploadFile = File(...),
+        export_format: ExportFormat = Form('ndjson'),
+        admission: AdmissionTicket = Depends(admission_control),
+):
+    chunks = export_profissionais_service.execute(file, export_format)
+    media_types = {'ndjson': 'application/x-ndjson', 'parquet': 'application/vnd.apache.parquet'}
+    return StreamingResponse(
+        admission.wrap(chunks),
+        media_type=media_types[export_format],
+        headers={'Content-Disposition': f'attachment; filename="profissionais.{export_format}"'}
+    )
+
+
+@router.post('/batch')
+def generate_reports_batch(
+        file: UploadFile = File(...),
+        filters: list[ReportFilters] = Depends(get_report_batch_filters),
+        include_pdf: bool = Form(True),
+        admission: AdmissionTicket = Depends(admission_control),
+):
+    lines = generate_reports_batch_service.execute(file, filters, include_pdf)
+    return StreamingResponse(admission.wrap(lines), media_type='application/x-ndjson')
+
+
+@router.post('/datasets', dependencies=[Depends(admission_control)])
+def register_municipality_dataset(
+        file: UploadFile = File(...),
+) -> MunicipalityDatasetOutDTO:
+    return register_municipality_dataset_service.execute(file)
+
+
+@router.get('/datasets/{dataset_id}/municipios')
+def lookup_municipality(
+        dataset_id: str,
+        value: str,
+        limit: int = Query(5, ge=1, le=50),
+) -> MunicipalityLookupOutDTO:
+    return lookup_municipality_service.execute(dataset_id, value, limit)
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+
+class MunicipalityDatasetOutDTO(BaseModel):
+    dataset_id: str
+    municipios: int
+
+
+class MunicipalitySuggestion(BaseModel):
+    uf: str
+    municipio: str
+    score: float
+
+
+class MunicipalityLookupOutDTO(BaseModel):
+    dataset_id: str
+    value: str
+    match: str | None = Field(default=None)
+    suggestions: list[MunicipalitySuggestion]
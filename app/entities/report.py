@@ -1,10 +1,20 @@
 from datetime import datetime
 
-from typing import Literal
+from typing import Any, Literal
 
 import pytz
 from fastapi import UploadFile
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+
+
+ExportFormat = Literal['ndjson', 'parquet']
+MetricValue = str | int | float
+
+_metric_value_adapter = TypeAdapter(MetricValue)
+
+
+def report_created_at() -> datetime:
+    return datetime.now(pytz.timezone('America/Sao_Paulo'))
 
 
 class ReportFilters(BaseModel):
@@ -19,7 +29,7 @@ class ReportInDTO(BaseModel):
 
 class Metric(BaseModel):
     metric: str
-    value: str | int | float
+    value: MetricValue
 
 
 class Section(BaseModel):
@@ -30,4 +40,21 @@ class Section(BaseModel):
 class ReportInfoOutDTO(BaseModel):
     title: str
     sections: list[Section]
-    created_at: datetime = Field(default=datetime.now(pytz.timezone('America/Sao_Paulo')))
+    created_at: datetime = Field(default_factory=report_created_at)
+
+
+# Formas simples dos modelos acima, usadas no caminho de resposta: os relatórios são montados como dicts e vão direto
+# para o orjson, sem instanciar e depois despejar um Section/Metric por métrica
+def metric(metric: str, value: Any) -> dict[str, Any]:
+    if type(value) not in (str, int, float):
+        # Escalares do numpy e afins recebem a mesma coerção que a validação de Metric aplicaria
+        value = _metric_value_adapter.validate_python(value)
+    return {'metric': metric, 'value': value}
+
+
+def section(name: str, metrics: list[dict[str, Any]]) -> dict[str, Any]:
+    return {'name': name, 'metrics': metrics}
+
+
+def report_info(title: str, sections: list[dict[str, Any]]) -> dict[str, Any]:
+    return {'title': title, 'sections': sections, 'created_at': report_created_at()}
@@ -0,0 +1,14 @@
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+ERROR_MSG = 'DATASET_NOT_FOUND_EXCEPTION'
+
+
+class DatasetNotFoundException(HTTPException):
+    def __init__(self) -> None:
+        self.status_code = 404
+        self.detail = ERROR_MSG
+
+
+class DatasetNotFoundModel(BaseModel):
+    error_msg: str | None = ERROR_MSG
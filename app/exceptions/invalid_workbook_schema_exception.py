@@ -0,0 +1,20 @@
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+ERROR_MSG = 'INVALID_WORKBOOK_SCHEMA_EXCEPTION'
+
+
+class InvalidWorkbookSchemaException(HTTPException):
+    def __init__(self, missing_sheets: list[str], missing_columns: dict[str, list[str]]) -> None:
+        self.status_code = 422
+        self.detail = {
+            'error_msg': ERROR_MSG,
+            'missing_sheets': missing_sheets,
+            'missing_columns': missing_columns,
+        }
+
+
+class InvalidWorkbookSchemaModel(BaseModel):
+    error_msg: str | None = ERROR_MSG
+    missing_sheets: list[str] = []
+    missing_columns: dict[str, list[str]] = {}
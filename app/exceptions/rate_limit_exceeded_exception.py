@@ -0,0 +1,17 @@
+import math
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+ERROR_MSG = 'RATE_LIMIT_EXCEEDED_EXCEPTION'
+
+
+class RateLimitExceededException(HTTPException):
+    def __init__(self, retry_after: float) -> None:
+        self.status_code = 429
+        self.detail = ERROR_MSG
+        self.headers = {'Retry-After': str(max(1, math.ceil(retry_after)))}
+
+
+class RateLimitExceededModel(BaseModel):
+    error_msg: str | None = ERROR_MSG
@@ -0,0 +1,17 @@
+import math
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+ERROR_MSG = 'SERVICE_OVERLOADED_EXCEPTION'
+
+
+class ServiceOverloadedException(HTTPException):
+    def __init__(self, retry_after: float) -> None:
+        self.status_code = 503
+        self.detail = ERROR_MSG
+        self.headers = {'Retry-After': str(max(1, math.ceil(retry_after)))}
+
+
+class ServiceOverloadedModel(BaseModel):
+    error_msg: str | None = ERROR_MSG
@@ -0,0 +1,163 @@
+import hashlib
+import hmac
+import io
+import logging
+from typing import TYPE_CHECKING, Any, Iterator
+
+from fastapi import UploadFile
+
+from app.entities.report import ExportFormat
+from app.services.get_report_info_service import GetReportInfoService
+from app.utils.ndjson import to_ndjson_line
+from app.utils.settings import settings
+from app.utils.workbook_schema import PROFISSIONAL_SCHEMA
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class ExportProfissionaisService:
+    BATCH_SIZE = 1000
+    TITLE = 'Relatório do(a) Médico(a)'
+
+    def __init__(self):
+        self.get_report_info_service = GetReportInfoService()
+
+    def execute(self, file: UploadFile, export_format: ExportFormat) -> Iterator[bytes]:
+        sheets = self.get_report_info_service.load_validated_sheets(file, PROFISSIONAL_SCHEMA)
+        records = self.iter_records(sheets)
+        if export_format == 'parquet':
+            return self.__to_parquet(records)
+        return (to_ndjson_line(record) for record in records)
+
+    def iter_records(self, sheets: dict[Any, 'pd.DataFrame']) -> Iterator[dict]:
+        df_monitoramento = sheets["MQI_Monitoramento_PMMB"]
+
+        df_munic = sheets["MQI_Municipios_CGPLAD"]
+        totais_estado = df_munic.groupby("UF")["Total de vagas ocupadas"].sum().to_dict()
+        totais_municipio = df_munic.groupby(["UF", "Município"])["Total de vagas ocupadas"].sum().to_dict()
+
+        monitoramento = _GroupedSheet(df_monitoramento, "CPF")
+        maav = _GroupedSheet(sheets["LOG_Maav"], "CPF")
+        erario = _GroupedSheet(sheets["ERA_Erario"], "CPF")
+        licencas_medicas = _GroupedSheet(sheets["LIC_Licencas_Medicas"], "CPF")
+        licencas_parentais = _GroupedSheet(sheets["LIC_Matern_Patern"], "CPF")
+        avaliacoes = _GroupedSheet(sheets["PED_AvaliaMaisMedicos"], "CPF (Médico)")
+        processos = _GroupedSheet(sheets["NGA_ProcessosCGPP"], "CPF")
+
+        municipios_normalizados = {}
+        for cpf, positions in monitoramento.indices.items():
+            row = self.__excel_row(positions[0])
+            # O CPF sai mascarado como no relatório; cpf_hash (HMAC com a SECRET_KEY) é a chave estável para BI
+            identificacao = {"cpf": self.get_report_info_service.hide_cpf(cpf), "cpf_hash": self.__cpf_hash(cpf)}
+            if not cpf.isdigit():
+                # hide_cpf devolve o valor original quando não há 11 dígitos, então ele não é repetido aqui
+                yield from ({**identificacao, "cpf": None, "row": self.__excel_row(position), "error": "INVALID_CPF"}
+                            for position in positions)
+                continue
+
+            try:
+                profissional = monitoramento.row(positions[0])
+                estado = profissional["UF"]
+                municipio = profissional["Municipio/DSEI"]
+                if municipio not in municipios_normalizados:
+                    municipios_normalizados[municipio] = self.get_report_info_service.remove_accents(municipio).upper()
+
+                sections = self.get_report_info_service.build_sections_profissional(
+                    profissional=profissional,
+                    maav=maav.rows(cpf),
+                    erario=erario.rows(cpf),
+                    licencas_medicas=licencas_medicas.rows(cpf),
+                    licencas_parentais=licencas_parentais.rows(cpf),
+                    avaliacoes=avaliacoes.rows(cpf),
+                    processos=processos.rows(cpf),
+                    profissionais_totais_estado=totais_estado.get(estado, 0),
+                    profissionais_totais_municipio=totais_municipio.get((estado, municipios_normalizados[municipio]), 0),
+                )
+            except Exception:
+                logger.exception('Falha ao montar o relatório do profissional na linha %s', row)
+                yield {**identificacao, "row": row, "error": "INVALID_ROW"}
+                continue
+
+            yield {
+                **identificacao,
+                "title": self.TITLE,
+                "sections": sections,
+            }
+
+    @staticmethod
+    def __cpf_hash(cpf: str) -> str:
+        return hmac.new(settings.SECRET_KEY.encode('utf-8'), cpf.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def __excel_row(position: int) -> int:
+        # Posição no DataFrame -> linha na planilha (a linha 1 é o cabeçalho)
+        return int(position) + 2
+
+    def __to_parquet(self, records: Iterator[dict]) -> Iterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        metric_type = pa.struct([("metric", pa.string()), ("value", pa.string())])
+        section_type = pa.struct([("name", pa.string()), ("metrics", pa.list_(metric_type))])
+        schema = pa.schema([
+            ("cpf", pa.string()), ("cpf_hash", pa.string()),
+            ("title", pa.string()), ("sections", pa.list_(section_type)),
+            ("row", pa.int64()), ("error", pa.string()),
+        ])
+
+        sink = _ChunkedSink()
+        with pq.ParquetWriter(sink, schema) as writer:
+            batch = []
+            for record in records:
+                for section in record.get("sections", []):
+                    for metric in section["metrics"]:
+                        metric["value"] = str(metric["value"])
+                batch.append(record)
+                if len(batch) == self.BATCH_SIZE:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    batch = []
+                    yield sink.drain()
+            if batch:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+        yield sink.drain()
+
+
+class _GroupedSheet:
+    # Agrupa uma planilha por CPF guardando só as posições das linhas; cada linha só vira dict quando é usada,
+    # então a memória extra fica limitada às linhas do profissional sendo exportado
+    def __init__(self, df: 'pd.DataFrame', cpf_column: str):
+        self.columns = {column: df[column].array for column in df.columns}
+        self.indices = df.groupby(cpf_column, sort=False).indices
+
+    def row(self, position: int) -> dict:
+        return {column: values[position] for column, values in self.columns.items()}
+
+    def rows(self, cpf: str) -> list[dict]:
+        return [self.row(position) for position in self.indices.get(cpf, ())]
+
+
+class _ChunkedSink(io.RawIOBase):
+    # Destino de escrita que só mantém em memória os bytes ainda não enviados ao cliente
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
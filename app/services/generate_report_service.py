@@ -0,0 +1,18 @@
+from typing import Any
+
+from app.entities.report import ReportInDTO, ReportInfoOutDTO
+from app.services.get_report_file_pdf_service import GetReportFilePdfService
+from app.services.get_report_info_service import GetReportInfoService
+
+
+class GenerateReportService:
+    def __init__(self):
+        self.get_report_info_service = GetReportInfoService()
+        self.get_report_file_pdf_service = GetReportFilePdfService()
+
+    def execute(self, report_in_dto: ReportInDTO) -> tuple[dict[str, Any], bytes]:
+        # O relatório calculado vai direto para a renderização, sem passar por JSON
+        report = self.get_report_info_service.execute(report_in_dto)
+        # Renderiza sem o cache de PDFs: o created_at recém-gerado entra na chave, que nunca se repetiria
+        pdf_bytes = self.get_report_file_pdf_service.render(ReportInfoOutDTO.model_validate(report))
+        return report, pdf_bytes
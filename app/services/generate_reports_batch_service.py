@@ -0,0 +1,92 @@
+import base64
+import logging
+from typing import TYPE_CHECKING, Any, Iterator
+
+from fastapi import UploadFile, HTTPException
+
+from app.entities.report import ReportFilters, ReportInfoOutDTO
+from app.services.get_report_file_pdf_service import GetReportFilePdfService
+from app.services.get_report_info_service import GetReportInfoService
+from app.services.render_reports_pdf_pool_service import RenderReportsPdfPoolService
+from app.utils.ndjson import to_ndjson_line
+from app.utils.workbook_schema import merge_schemas, schema_for
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class GenerateReportsBatchService:
+    def __init__(self):
+        self.get_report_info_service = GetReportInfoService()
+        self.get_report_file_pdf_service = GetReportFilePdfService()
+        self.render_reports_pdf_pool_service = RenderReportsPdfPoolService()
+
+    def execute(self, file: UploadFile, filters: list[ReportFilters], include_pdf: bool = True) -> Iterator[bytes]:
+        digest = self.get_report_info_service.file_digest(file)
+        sheets = self.get_report_info_service.load_validated_sheets(
+            file, merge_schemas(schema_for(report_filters.type) for report_filters in filters), digest
+        )
+        return self.__generate(sheets, digest, filters, include_pdf)
+
+    def __generate(self, sheets: dict[Any, 'pd.DataFrame'], digest: str, filters: list[ReportFilters],
+                   include_pdf: bool) -> Iterator[bytes]:
+        if include_pdf and self.render_reports_pdf_pool_service.enabled:
+            yield from self.__generate_with_pool(sheets, digest, filters)
+            return
+        for index, report_filters in enumerate(filters):
+            item, report = self.__compute(sheets, digest, index, report_filters)
+            if report is not None and include_pdf:
+                try:
+                    # Direto no render(): o created_at recém-gerado entra na chave do cache de PDFs e nunca se repetiria
+                    item["pdf"] = self.__encode_pdf(
+                        self.get_report_file_pdf_service.render(ReportInfoOutDTO.model_validate(report))
+                    )
+                except Exception:
+                    logger.exception("Falha ao renderizar o PDF %s do lote", index)
+                    item = self.__error_item(item, 500, "INTERNAL_SERVER_ERROR")
+            yield to_ndjson_line(item)
+
+    def __generate_with_pool(self, sheets: dict[Any, 'pd.DataFrame'], digest: str,
+                             filters: list[ReportFilters]) -> Iterator[bytes]:
+        # Processa em janelas: as métricas são calculadas aqui e os PDFs da janela são renderizados em paralelo
+        window_size = self.render_reports_pdf_pool_service.window_size
+        for start in range(0, len(filters), window_size):
+            computed = [
+                self.__compute(sheets, digest, index, report_filters)
+                for index, report_filters in enumerate(filters[start:start + window_size], start=start)
+            ]
+            pdfs = self.render_reports_pdf_pool_service.execute(
+                ReportInfoOutDTO.model_validate(report) for _, report in computed if report is not None
+            )
+            for item, report in computed:
+                if report is not None:
+                    pdf_bytes = next(pdfs)
+                    if pdf_bytes is None:
+                        item = self.__error_item(item, 500, "INTERNAL_SERVER_ERROR")
+                    else:
+                        item["pdf"] = self.__encode_pdf(pdf_bytes)
+                yield to_ndjson_line(item)
+
+    def __compute(self, sheets: dict[Any, 'pd.DataFrame'], digest: str, index: int,
+                  report_filters: ReportFilters) -> tuple[dict, dict[str, Any] | None]:
+        item = {"index": index, "filters": report_filters.model_dump()}
+        try:
+            report = self.get_report_info_service.get_metrics(sheets, report_filters, digest)
+        except HTTPException as e:
+            return self.__error_item(item, e.status_code, e.detail), None
+        except Exception:
+            logger.exception("Falha ao calcular o relatório %s do lote", index)
+            return self.__error_item(item, 500, "INTERNAL_SERVER_ERROR"), None
+        item.update(status="ok", report=report)
+        return item, report
+
+    @staticmethod
+    def __error_item(item: dict, status_code: int, error: str) -> dict:
+        return {"index": item["index"], "filters": item["filters"], "status": "error", "status_code": status_code,
+                "error": error}
+
+    @staticmethod
+    def __encode_pdf(pdf_bytes: bytes) -> str:
+        return base64.b64encode(pdf_bytes).decode('ascii')
@@ -1,14 +1,37 @@
 from datetime import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.colors import HexColor
 import io
 from app.entities.report import ReportInfoOutDTO
+from app.utils.cache import CacheBackend, cache_key, get_cache_backend
 
 
 class GetReportFilePdfService:
+    FONTS = ["Helvetica", "Helvetica-Bold", "Helvetica-Oblique"]
+
+    def __init__(self, cache: CacheBackend | None = None):
+        self.cache = cache or get_cache_backend()
+
+    def warm_up(self):
+        from reportlab.pdfbase import pdfmetrics
+
+        for font_name in self.FONTS:
+            pdfmetrics.getFont(font_name)
 
     def execute(self, report: ReportInfoOutDTO) -> bytes:
+        if not self.cache.enabled:
+            return self.render(report)
+        key = cache_key('report-pdf', report.model_dump_json())
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        pdf_bytes = self.render(report)
+        self.cache.set(key, pdf_bytes)
+        return pdf_bytes
+
+    def render(self, report: ReportInfoOutDTO) -> bytes:
+        from reportlab.lib.colors import HexColor
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+
         pdf_io = io.BytesIO()
         c = canvas.Canvas(pdf_io, pagesize=A4)
         c.setTitle(f'{report.title} - {datetime.now().strftime("%d/%m/%Y")}')
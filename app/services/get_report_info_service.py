@@ -1,63 +1,154 @@
+import hashlib
+import pickle
 import re
 import unicodedata
 from datetime import datetime
 from io import BytesIO
-from typing import Any
+from typing import TYPE_CHECKING, Any, Mapping
 
-import pandas as pd
+import orjson
 from fastapi import UploadFile
 
-from app.entities.report import ReportInDTO, ReportFilters, ReportInfoOutDTO, Metric, Section
+from app.entities.report import ReportInDTO, ReportFilters, metric, report_created_at, report_info, section
 from app.exceptions.invalid_file_type_exception import InvalidFileTypeException
 from app.exceptions.locale_not_found_exception import LocaleNotFoundException
 from app.exceptions.profissional_not_found_exception import ProfissionalNotFoundException
+from app.utils.cache import CacheBackend, cache_key, get_cache_backend
+from app.utils.municipality_index import MunicipalityIndex, municipality_indexes
+from app.utils.workbook_schema import canonical_columns, read_headers, schema_for, validate_headers
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class GetReportInfoService:
+    def __init__(self, cache: CacheBackend | None = None):
+        self.cache = cache or get_cache_backend()
+
+    def execute(self, report_in_dto: ReportInDTO) -> dict[str, Any]:
+        self.raise_if_file_is_invalid(report_in_dto.file)
+        digest = self.file_digest(report_in_dto.file)
+        if not self.cache.enabled:
+            self.validate_schema(report_in_dto.file, schema_for(report_in_dto.filters.type))
+            return self.get_metrics(self.process_xlsx(report_in_dto.file), report_in_dto.filters, digest)
+
+        key = cache_key('report-info', digest, report_in_dto.filters.model_dump_json())
+        cached = self.cache.get(key)
+        if cached is not None:
+            # Só existe entrada para este arquivo e tipo de filtro se os cabeçalhos já foram validados antes
+            return {**orjson.loads(cached), 'created_at': report_created_at()}
+
+        self.validate_schema(report_in_dto.file, schema_for(report_in_dto.filters.type))
+        sheets = self.load_sheets(report_in_dto.file, digest)
+        report = self.get_metrics(sheets, report_in_dto.filters, digest)
+        # created_at fica de fora: num acerto de cache o relatório recebe o horário da requisição atual
+        self.cache.set(key, orjson.dumps({'title': report['title'], 'sections': report['sections']}))
+        return report
+
+    def load_validated_sheets(self, file: UploadFile, schema: dict[str, list[str]],
+                              digest: str | None = None) -> dict[Any, 'pd.DataFrame']:
+        # Usado pelos endpoints em streaming: validação e leitura acontecem antes do primeiro byte da resposta,
+        # para que erros ainda virem respostas HTTP normais
+        self.raise_if_file_is_invalid(file)
+        self.validate_schema(file, schema)
+        return self.load_sheets(file, digest)
+
+    def load_sheets(self, file: UploadFile, digest: str | None = None) -> dict[Any, 'pd.DataFrame']:
+        # As planilhas já processadas ficam no cache, então os workers do nó fazem o parse de cada arquivo uma vez só
+        if not self.cache.enabled:
+            return self.process_xlsx(file)
+        key = cache_key('sheets', digest or self.file_digest(file))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return pickle.loads(cached)
+        sheets = self.process_xlsx(file)
+        self.cache.set(key, pickle.dumps(sheets, protocol=pickle.HIGHEST_PROTOCOL))
+        return sheets
 
-    def execute(self, report_in_dto: ReportInDTO) -> ReportInfoOutDTO:
-        self.__raise_if_file_is_invalid(report_in_dto.file)
-        sheets = self.process_xlsx(report_in_dto.file)
-        report_info_out_dto = self.get_metrics(sheets, report_in_dto.filters)
-        return report_info_out_dto
+    @staticmethod
+    def file_digest(file: UploadFile) -> str:
+        file.file.seek(0)
+        return hashlib.sha256(file.file.read()).hexdigest()
 
     @staticmethod
-    def __raise_if_file_is_invalid(file: UploadFile):
+    def raise_if_file_is_invalid(file: UploadFile):
         if file.headers['content-type'] != 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet':
             raise InvalidFileTypeException
 
     @staticmethod
-    def process_xlsx(file: UploadFile) -> dict[Any, pd.DataFrame]:
+    def validate_schema(file: UploadFile, schema: dict[str, list[str]]):
+        # Confere apenas os cabeçalhos, para rejeitar planilhas incompletas antes do parse completo
+        file.file.seek(0)
+        validate_headers(read_headers(file.file.read()), schema)
+
+    @staticmethod
+    def process_xlsx(file: UploadFile) -> dict[Any, 'pd.DataFrame']:
+        import pandas as pd
+
         file.file.seek(0)
         contents = file.file.read()
         excel_io = BytesIO(contents)
         sheets = pd.read_excel(excel_io, sheet_name=None)
         for nome_planilha, df in sheets.items():
+            df = sheets[nome_planilha] = df.rename(columns=canonical_columns(nome_planilha, df.columns))
             col_cpf = [col for col in df.columns if 'CPF' in col]
             if col_cpf:
                 cpf_col_name = col_cpf[0]
                 sheets[nome_planilha][cpf_col_name] = df[cpf_col_name].astype(str).str.zfill(11)
         return sheets
 
-    def get_metrics(self, sheets: dict[Any, pd.DataFrame], filters: ReportFilters) -> ReportInfoOutDTO:
+    def get_metrics(self, sheets: dict[Any, 'pd.DataFrame'], filters: ReportFilters,
+                    digest: str | None = None) -> dict[str, Any]:
+        # Relatório como estrutura simples (ver report_info); ReportInfoOutDTO.model_validate o converte quando
+        # um consumidor precisa do modelo, como a renderização do PDF
         if filters.type == 'REGIONAL':
-            return ReportInfoOutDTO(
-                title=f'Relatório Municipal - {filters.value.split("|")[1].title()}/{filters.value.split("|")[0].upper()}',
-                sections=self.get_metrics_regional(sheets, filters.value)
+            estado, municipio, nome_municipio = self.resolve_locale(sheets, filters.value, digest)
+            return report_info(
+                title=f'Relatório Municipal - {nome_municipio.title()}/{estado}',
+                sections=self.get_metrics_regional(sheets, estado, municipio)
             )
         else:
-            return ReportInfoOutDTO(
+            return report_info(
                 title=f'Relatório do(a) Médico(a)',
                 sections=self.get_metrics_profissional(sheets, filters.value.upper())
             )
 
-    def get_metrics_regional(self, sheets, filter_value) -> list[Section]:
-        estado = str(filter_value.split('|')[0]).upper()
-        municipio = self.remove_accents(str(filter_value.split('|')[1])).upper()
+    def resolve_locale(self, sheets, filter_value, digest: str | None = None) -> tuple[str, str, str]:
+        # Retorna a UF, o município como está na planilha e o nome a exibir no título
+        partes = str(filter_value).split('|')
+        if len(partes) < 2:
+            raise LocaleNotFoundException
+        estado = partes[0].upper()
+        municipio_informado = partes[1]
 
+        df_munic = sheets["MQI_Municipios_CGPLAD"]
+        df_estado = df_munic[df_munic["UF"] == estado]
+        if df_estado.empty:
+            raise LocaleNotFoundException
+
+        municipio = self.remove_accents(municipio_informado).upper()
+        if (df_estado["Município"] == municipio).any():
+            return estado, municipio, municipio_informado
+
+        # Grafias diferentes (pontuação, preposições, código IBGE) são resolvidas para o nome canônico
+        index = self.municipality_index(sheets, digest) if digest else MunicipalityIndex.from_dataframe(df_estado)
+        municipio = index.resolve(estado, municipio_informado)
+        if municipio is None:
+            raise LocaleNotFoundException
+        return estado, municipio, municipio
+
+    @staticmethod
+    def municipality_index(sheets, digest: str) -> MunicipalityIndex:
+        # Montado uma vez por arquivo (todas as UFs) e compartilhado com /datasets, cujo dataset_id é o mesmo digest
+        return municipality_indexes.get_or_build(
+            digest, lambda: MunicipalityIndex.from_dataframe(sheets["MQI_Municipios_CGPLAD"])
+        )
+
+    def get_metrics_regional(self, sheets, estado, municipio) -> list[dict[str, Any]]:
         # ===== Sheet MQI_Municipios_CGPLAD =====
         df_munic = sheets["MQI_Municipios_CGPLAD"]
-        regiao = df_munic[df_munic["UF"] == estado]["Região"].iloc[0]
+        df_estado = df_munic[df_munic["UF"] == estado]
+        regiao = df_estado["Região"].iloc[0]
 
         # Região
         df_regiao = df_munic[df_munic["Região"] == regiao]
@@ -66,7 +157,6 @@ class GetReportInfoService:
         profissionais_totais_regiao = df_regiao["Total de vagas ocupadas"].sum()
 
         # Estado
-        df_estado = df_munic[df_munic["UF"] == estado]
         populacao_total_estado = df_estado["População 2021"].sum()
         profissionais_totais_estado = df_estado["Total de vagas ocupadas"].sum()
         potencial_cobertura_estado = df_estado["Potencial de cobertura da população pelo Programa "].sum()
@@ -78,13 +168,7 @@ class GetReportInfoService:
         percentual_potencial_cobertura_estado = (potencial_cobertura_estado / populacao_total_estado * 100)
 
         # Município
-        df_municipio = df_munic[
-            (df_munic["UF"] == estado) &
-            (df_munic["Município"] == municipio)
-            ]
-
-        if df_municipio.empty:
-            raise LocaleNotFoundException
+        df_municipio = df_estado[df_estado["Município"] == municipio]
 
         populacao_total_municipio = df_municipio["População 2021"].sum()
         profissionais_totais_municipio = df_municipio["Total de vagas ocupadas"].sum()
@@ -126,41 +210,41 @@ class GetReportInfoService:
         percentual_municipal = (financiamento_municipal / total_vagas_monitor * 100)
 
         return [
-            Section(name=f"Região: {regiao}", metrics=[
-                Metric(metric="Quantidade de estados", value=quantidade_de_estados_regiao),
-                Metric(metric="População total", value=self.format_number(populacao_total_regiao)),
-                Metric(metric="Quantidade de profissionais do PMMB",
+            section(name=f"Região: {regiao}", metrics=[
+                metric(metric="Quantidade de estados", value=quantidade_de_estados_regiao),
+                metric(metric="População total", value=self.format_number(populacao_total_regiao)),
+                metric(metric="Quantidade de profissionais do PMMB",
                        value=self.format_number(profissionais_totais_regiao))
             ]),
-            Section(name=f"Estado: {self.get_nome_estado_by_sigla(estado)}", metrics=[
-                Metric(metric="Quantidade de municípios", value=quantidade_de_municipios_estado),
-                Metric(metric="Municípios que possuem no mínimo 1 médico",
+            section(name=f"Estado: {self.get_nome_estado_by_sigla(estado)}", metrics=[
+                metric(metric="Quantidade de municípios", value=quantidade_de_municipios_estado),
+                metric(metric="Municípios que possuem no mínimo 1 médico",
                        value=f"Total: {total_municipios_contemplatos_estado} ({percentual_municipios_contemplados_estado: .2f}%)"),
-                Metric(metric="População total", value=self.format_number(populacao_total_estado)),
-                Metric(metric="Total de profissionais do PMMB", value=self.format_number(profissionais_totais_estado)),
-                Metric(metric="Potencial de cobertura dos médicos do PMMB",
+                metric(metric="População total", value=self.format_number(populacao_total_estado)),
+                metric(metric="Total de profissionais do PMMB", value=self.format_number(profissionais_totais_estado)),
+                metric(metric="Potencial de cobertura dos médicos do PMMB",
                        value=f"Total: {self.format_number(potencial_cobertura_estado)} ({percentual_potencial_cobertura_estado: .2f}%)")
             ]),
-            Section(name=f"Município: {municipio.title()}", metrics=[
-                Metric(metric="População total", value=self.format_number(populacao_total_municipio)),
-                Metric(metric="Total de profissionais do PMMB", value=profissionais_totais_municipio),
-                Metric(metric="Potencial de cobertura dos médicos do PMMB",
+            section(name=f"Município: {municipio.title()}", metrics=[
+                metric(metric="População total", value=self.format_number(populacao_total_municipio)),
+                metric(metric="Total de profissionais do PMMB", value=profissionais_totais_municipio),
+                metric(metric="Potencial de cobertura dos médicos do PMMB",
                        value=f"Total: {self.format_number(potencial_cobertura_municipio)} ({percentual_potencial_cobertura_municipio: .2f}%)"),
-                Metric(metric="Índice de vulnerabilidade social", value=str(vulnerabilidade_social_municipio))
+                metric(metric="Índice de vulnerabilidade social", value=str(vulnerabilidade_social_municipio))
             ]),
-            Section(name="Vagas", metrics=[
-                Metric(metric="Ocupadas", value=f"Total: {ocupadas} ({percentual_ocupadas: .2f}%)"),
-                Metric(metric="Desocupadas", value=f"Total: {desocupadas} ({percentual_desocupadas: .2f}%)"),
-                Metric(metric="Ativas", value=f"Total: {ativas} ({percentual_ativas: .2f}%)"),
-                Metric(metric="Inativas", value=f"Total: {inativas} ({percentual_inativas: .2f}%)")
+            section(name="Vagas", metrics=[
+                metric(metric="Ocupadas", value=f"Total: {ocupadas} ({percentual_ocupadas: .2f}%)"),
+                metric(metric="Desocupadas", value=f"Total: {desocupadas} ({percentual_desocupadas: .2f}%)"),
+                metric(metric="Ativas", value=f"Total: {ativas} ({percentual_ativas: .2f}%)"),
+                metric(metric="Inativas", value=f"Total: {inativas} ({percentual_inativas: .2f}%)")
             ]),
-            Section(name="Financiamento", metrics=[
-                Metric(metric="Federal", value=f"Total: {financiamento_federal} ({percentual_federal: .2f}%)"),
-                Metric(metric="Municipal", value=f"Total: {financiamento_municipal} ({percentual_municipal: .2f}%)")
+            section(name="Financiamento", metrics=[
+                metric(metric="Federal", value=f"Total: {financiamento_federal} ({percentual_federal: .2f}%)"),
+                metric(metric="Municipal", value=f"Total: {financiamento_municipal} ({percentual_municipal: .2f}%)")
             ])
         ]
 
-    def get_metrics_profissional(self, sheets, filter_value) -> list[Section]:
+    def get_metrics_profissional(self, sheets, filter_value) -> list[dict[str, Any]]:
         cpf = filter_value
         df_profissional = sheets["MQI_Monitoramento_PMMB"][sheets["MQI_Monitoramento_PMMB"]["CPF"] == cpf]
 
@@ -177,27 +261,59 @@ class GetReportInfoService:
         ]
         profissionais_totais_municipio = df_municipio["Total de vagas ocupadas"].sum()
 
-        cpf_profissional = df_profissional['CPF'].iloc[0]
-        nome_profissional = df_profissional['Nome do Médico ATIVO'].iloc[0]
-        ciclo_profissional = df_profissional['Ciclo'].iloc[0]
-        perfil_profissional = df_profissional['Perfil do Médico'].iloc[0]
+        df_maav = sheets["LOG_Maav"]
+        df_erario = sheets["ERA_Erario"]
+        df_lic_med = sheets["LIC_Licencas_Medicas"]
+        df_lic_parental = sheets["LIC_Matern_Patern"]
+        df_avaliacoes = sheets["PED_AvaliaMaisMedicos"]
+        df_processos = sheets["NGA_ProcessosCGPP"]
+
+        return self.build_sections_profissional(
+            profissional=df_profissional.iloc[0],
+            maav=df_maav[df_maav["CPF"] == cpf].to_dict('records'),
+            erario=df_erario[df_erario["CPF"] == cpf].to_dict('records'),
+            licencas_medicas=df_lic_med[df_lic_med["CPF"] == cpf].to_dict('records'),
+            licencas_parentais=df_lic_parental[df_lic_parental["CPF"] == cpf].to_dict('records'),
+            avaliacoes=df_avaliacoes[df_avaliacoes["CPF (Médico)"] == cpf].to_dict('records'),
+            processos=df_processos[df_processos["CPF"] == cpf].to_dict('records'),
+            profissionais_totais_estado=profissionais_totais_estado,
+            profissionais_totais_municipio=profissionais_totais_municipio,
+        )
+
+    def build_sections_profissional(
+            self,
+            profissional: Mapping[str, Any],
+            maav: list[Mapping[str, Any]],
+            erario: list[Mapping[str, Any]],
+            licencas_medicas: list[Mapping[str, Any]],
+            licencas_parentais: list[Mapping[str, Any]],
+            avaliacoes: list[Mapping[str, Any]],
+            processos: list[Mapping[str, Any]],
+            profissionais_totais_estado,
+            profissionais_totais_municipio,
+    ) -> list[dict[str, Any]]:
+        # Recebe as linhas de cada planilha já filtradas pelo CPF (usado também pela exportação em lote)
+        municipio_profissional = profissional['Municipio/DSEI']
+        estado_profissional = profissional['UF']
+        cpf_profissional = profissional['CPF']
+        nome_profissional = profissional['Nome do Médico ATIVO']
+        ciclo_profissional = profissional['Ciclo']
+        perfil_profissional = profissional['Perfil do Médico']
         foi_para_maav = "NÃO"
         if perfil_profissional.strip().upper() == "INTERCAMBISTA" or perfil_profissional.strip().upper() == "RMS":
-            df_maav = sheets["LOG_Maav"]
-            df_maav_filtrado = df_maav[df_maav["CPF"] == cpf]
-            if not df_maav_filtrado.empty:
-                resposta_maav = df_maav_filtrado["FOI PARA O MAAv?"].iloc[0]
+            if maav:
+                resposta_maav = maav[0]["FOI PARA O MAAv?"]
                 if isinstance(resposta_maav, str) and resposta_maav.strip().upper() == "SIM":
                     foi_para_maav = "SIM"
             perfil_profissional += f' - Foi para o MAAv? {foi_para_maav}'
 
-        sexo_profissional = df_profissional['Gênero'].iloc[0]
-        idade_profissional = str(df_profissional['Idade'].iloc[0])
-        raca_cor_profissional = df_profissional['Raça / cor'].iloc[0]
-        nacionalidade_profissional = df_profissional['Nacionalidade'].iloc[0]
+        sexo_profissional = profissional['Gênero']
+        idade_profissional = str(profissional['Idade'])
+        raca_cor_profissional = profissional['Raça / cor']
+        nacionalidade_profissional = profissional['Nacionalidade']
 
-        inicio_atividades_dt = df_profissional['Início das Atividades'].iloc[0]
-        fim_atividades_dt = df_profissional['Fim das Atividades'].iloc[0]
+        inicio_atividades_dt = profissional['Início das Atividades']
+        fim_atividades_dt = profissional['Fim das Atividades']
 
         inicio_atividades = inicio_atividades_dt.strftime("%d/%m/%Y") if isinstance(inicio_atividades_dt,
                                                                                     datetime) else str(
@@ -210,25 +326,20 @@ class GetReportInfoService:
         else:
             fim_atividades = str(fim_atividades_dt)
 
-        df_erario = sheets["ERA_Erario"]
-        df_erario_filtrado = df_erario[df_erario["CPF"] == cpf]
-        if df_erario_filtrado.empty:
+        if not erario:
             teve_erario_profissional = 'NÃO'
         else:
             teve_erario_profissional = (
-                "SIM" if not df_erario_filtrado.empty and df_erario_filtrado["NECESSÁRIA RESTITUIÇÃO? S/N"].iloc[0] == "SIM"
+                "SIM" if erario[0]["NECESSÁRIA RESTITUIÇÃO? S/N"] == "SIM"
                 else "NÃO"
             )
-        metrics_erario = [Metric(metric="Teve erário?", value=teve_erario_profissional)]
+        metrics_erario = [metric(metric="Teve erário?", value=teve_erario_profissional)]
         if teve_erario_profissional == 'SIM':
-            metrics_erario.append(Metric(metric="Motivo", value="DESLIGAMENTO"))
+            metrics_erario.append(metric(metric="Motivo", value="DESLIGAMENTO"))
 
-        especializacao_profissional = df_profissional['Oferta Formativa\nAtual 11/04/2025'].iloc[0]
+        especializacao_profissional = profissional['Oferta Formativa']
         instituicao_ensino_especializacao = \
-        df_profissional['Instituição de Ensino Superior\nque o Profissional está Vinculado'].iloc[0]
-
-        df_lic_med = sheets["LIC_Licencas_Medicas"]
-        df_lic_med_filtrado = df_lic_med[df_lic_med["CPF"] == cpf]
+        profissional['Instituição de Ensino Superior\nque o Profissional está Vinculado']
 
         metrics_licenca = []
         licencas_medicas_profissional = [
@@ -237,17 +348,15 @@ class GetReportInfoService:
                 "inicio": row["INICIO DA LICENÇA MÉDICA"],
                 "fim": row["TERMINO DA LICENÇA MÉDICA"]
             }
-            for _, row in df_lic_med_filtrado.iterrows()
+            for row in licencas_medicas
         ]
 
-        df_lic_parental = sheets["LIC_Matern_Patern"]
-        df_lic_parental_filtrado = df_lic_parental[df_lic_parental["CPF"] == cpf]
         licencas_parental_profissional = [
             {
                 "tipo": row["Tipo de Licença"],
                 "inicio": row["INÍCIO DA LICENÇA"]
             }
-            for _, row in df_lic_parental_filtrado.iterrows()
+            for row in licencas_parentais
         ]
 
         for licenca_medica in licencas_medicas_profissional:
@@ -256,18 +365,15 @@ class GetReportInfoService:
                 licenca_medica['inicio'])
             fim = licenca_medica['fim'].strftime('%d/%m/%Y') if isinstance(licenca_medica['fim'], datetime) else str(
                 licenca_medica['fim'])
-            metrics_licenca.append(Metric(metric=licenca_medica['tipo'], value=f"{inicio} - {fim}"))
+            metrics_licenca.append(metric(metric=licenca_medica['tipo'], value=f"{inicio} - {fim}"))
 
         for licenca_parental in licencas_parental_profissional:
             inicio = licenca_parental['inicio'].strftime('%d/%m/%Y') if isinstance(licenca_parental['inicio'],
                                                                                    datetime) else str(
                 licenca_parental['inicio'])
-            metrics_licenca.append(Metric(metric=licenca_parental['tipo'], value=inicio))
+            metrics_licenca.append(metric(metric=licenca_parental['tipo'], value=inicio))
 
-        df_avaliacoes = sheets["PED_AvaliaMaisMedicos"]
-        df_avaliacoes_filtrado = df_avaliacoes[df_avaliacoes["CPF (Médico)"] == cpf]
-
-        if df_avaliacoes_filtrado.empty:
+        if not avaliacoes:
             profissional_avaliado = "NÃO"
             avaliacoes_profissional = []
         else:
@@ -277,24 +383,21 @@ class GetReportInfoService:
                     "tipo": row["Tipo Avaliação"],
                     "nota": row["Nota Final"]
                 }
-                for _, row in df_avaliacoes_filtrado.iterrows()
+                for row in avaliacoes
             ]
-        metrics_avaliacoes = [Metric(metric="Foi avaliado?", value=profissional_avaliado)]
+        metrics_avaliacoes = [metric(metric="Foi avaliado?", value=profissional_avaliado)]
         if profissional_avaliado == "SIM":
-            metrics_avaliacoes.append(Metric(metric="Ano da avaliação", value="2024"))
+            metrics_avaliacoes.append(metric(metric="Ano da avaliação", value="2024"))
             for avaliacao in avaliacoes_profissional:
-                metrics_avaliacoes.append(Metric(metric=f"Nota - {avaliacao['tipo']}", value=str(avaliacao['nota'])))
-
-        df_processos = sheets["NGA_ProcessosCGPP"]
-        df_processos_filtrado = df_processos[df_processos["CPF"] == cpf]
+                metrics_avaliacoes.append(metric(metric=f"Nota - {avaliacao['tipo']}", value=str(avaliacao['nota'])))
 
-        if df_processos_filtrado.empty:
+        if not processos:
             tem_processo_administrativo = "NÃO"
             processos_administrativos_profissional = []
         else:
             tem_processo_administrativo = "SIM"
             processos_administrativos_profissional = []
-            for _, row in df_processos_filtrado.iterrows():
+            for row in processos:
                 causas = [row["CAUSA 1"], row["CAUSA 2"], row["CAUSA 3"]]
                 causas_limpa = [c.strip() for c in causas if isinstance(c, str) and c.strip() != "-" and c.strip()]
                 causas_str = ", ".join(causas_limpa)
@@ -304,38 +407,38 @@ class GetReportInfoService:
                 })
 
         metrics_processos_adm = [
-            Metric(metric="Profissional possui processos?", value=tem_processo_administrativo)]
+            metric(metric="Profissional possui processos?", value=tem_processo_administrativo)]
         for processo_adm in processos_administrativos_profissional:
-            metrics_processos_adm.append(Metric(metric=processo_adm['categoria'], value=processo_adm['causas']))
+            metrics_processos_adm.append(metric(metric=processo_adm['categoria'], value=processo_adm['causas']))
 
         return [
-            Section(name="Dados do profissional", metrics=[
-                Metric(metric="CPF", value=self.hide_cpf(cpf_profissional)),
-                Metric(metric="Nome completo", value=nome_profissional),
-                Metric(metric="Ciclo", value=ciclo_profissional),
-                Metric(metric="Perfil", value=perfil_profissional),
-                Metric(metric="Sexo", value=sexo_profissional),
-                Metric(metric="Idade", value=idade_profissional),
-                Metric(metric="Raça/cor", value=raca_cor_profissional),
-                Metric(metric="Município", value=municipio_profissional + "/" + estado_profissional),
-                Metric(metric="Nacionalidade", value=nacionalidade_profissional)
+            section(name="Dados do profissional", metrics=[
+                metric(metric="CPF", value=self.hide_cpf(cpf_profissional)),
+                metric(metric="Nome completo", value=nome_profissional),
+                metric(metric="Ciclo", value=ciclo_profissional),
+                metric(metric="Perfil", value=perfil_profissional),
+                metric(metric="Sexo", value=sexo_profissional),
+                metric(metric="Idade", value=idade_profissional),
+                metric(metric="Raça/cor", value=raca_cor_profissional),
+                metric(metric="Município", value=municipio_profissional + "/" + estado_profissional),
+                metric(metric="Nacionalidade", value=nacionalidade_profissional)
             ]),
-            Section(name="Período de exercício das atividades", metrics=[
-                Metric(metric="Início", value=inicio_atividades),
-                Metric(metric="Fim", value=fim_atividades),
+            section(name="Período de exercício das atividades", metrics=[
+                metric(metric="Início", value=inicio_atividades),
+                metric(metric="Fim", value=fim_atividades),
             ]),
-            Section(name="Licenças", metrics=metrics_licenca),
-            Section(name="Erário", metrics=metrics_erario),
-            Section(name="Situação acadêmica", metrics=[
-                Metric(metric="Especialização", value=str(especializacao_profissional)),
-                Metric(metric="Instituição de ensino", value=str(instituicao_ensino_especializacao))
+            section(name="Licenças", metrics=metrics_licenca),
+            section(name="Erário", metrics=metrics_erario),
+            section(name="Situação acadêmica", metrics=[
+                metric(metric="Especialização", value=str(especializacao_profissional)),
+                metric(metric="Instituição de ensino", value=str(instituicao_ensino_especializacao))
             ]),
-            Section(name="Avaliação do profissional", metrics=metrics_avaliacoes),
-            Section(name="Processos", metrics=metrics_processos_adm),
-            Section(name="Dados Gerais", metrics=[
-                Metric(metric=f"Total de profissionais no estado: {estado_profissional}",
+            section(name="Avaliação do profissional", metrics=metrics_avaliacoes),
+            section(name="Processos", metrics=metrics_processos_adm),
+            section(name="Dados Gerais", metrics=[
+                metric(metric=f"Total de profissionais no estado: {estado_profissional}",
                        value=str(profissionais_totais_estado)),
-                Metric(metric=f"Total de profissionais no município: {municipio_profissional}",
+                metric(metric=f"Total de profissionais no município: {municipio_profissional}",
                        value=str(profissionais_totais_municipio))
             ]),
         ]
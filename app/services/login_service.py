@@ -1,6 +1,5 @@
-from jose import jwt
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
+from functools import cached_property
 
 from app.entities.user import LoginRequest, Token
 from app.exceptions.invalid_user_credentials_exception import InvalidUserCredentialsException
@@ -13,9 +12,14 @@ class LoginService:
         self.SECRET_KEY = settings.SECRET_KEY
         self.ALGORITHM = "HS256"
         self.ACCESS_TOKEN_EXPIRE_MINUTES = 120
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
         self.db = db
 
+    @cached_property
+    def pwd_context(self):
+        from passlib.context import CryptContext
+
+        return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
     def execute(self, login_request: LoginRequest):
         user = self.get_user_by_email(login_request.email)
         if not user or not self.verify_password(login_request.password, user["hashed_password"]):
@@ -46,6 +50,8 @@ class LoginService:
         return self.pwd_context.verify(plain_password, hashed_password)
 
     def create_access_token(self, data: dict, expires_delta: timedelta | None = None):
+        from jose import jwt
+
         to_encode = data.copy()
         expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
         to_encode.update({"exp": expire})
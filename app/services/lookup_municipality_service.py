@@ -0,0 +1,44 @@
+import sqlite3
+from functools import lru_cache
+
+from app.entities.municipality import MunicipalityLookupOutDTO, MunicipalitySuggestion
+from app.exceptions.dataset_not_found_exception import DatasetNotFoundException
+from app.utils.database import db
+from app.utils.municipality_index import MunicipalityIndex, municipality_indexes
+
+
+@lru_cache(maxsize=32)
+def _load_index(dataset_id: str) -> MunicipalityIndex:
+    # O dataset_id é o hash do arquivo, então o índice de um mesmo id nunca muda e pode ficar em memória. O banco
+    # segue decidindo se o dataset foi cadastrado; o índice em si é o mesmo usado pelos relatórios desse arquivo
+    try:
+        with db.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT uf, municipio, codigo_ibge FROM municipality_datasets WHERE dataset_id = ?",
+                (dataset_id,)
+            )
+            rows = cursor.fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    if not rows:
+        raise DatasetNotFoundException
+    return municipality_indexes.get_or_build(dataset_id, lambda: MunicipalityIndex(rows))
+
+
+class LookupMunicipalityService:
+    def execute(self, dataset_id: str, value: str, limit: int = 5) -> MunicipalityLookupOutDTO:
+        index = _load_index(dataset_id)
+        uf, _, municipio = value.rpartition('|')
+
+        match = index.resolve(uf, municipio) if uf else None
+        suggestions = [] if match else [
+            MunicipalitySuggestion(uf=entry_uf, municipio=entry_municipio, score=score)
+            for entry_uf, entry_municipio, score in index.suggest(uf or None, municipio, limit)
+        ]
+        return MunicipalityLookupOutDTO(
+            dataset_id=dataset_id,
+            value=value,
+            match=f'{uf.strip().upper()}|{match}' if match else None,
+            suggestions=suggestions
+        )
@@ -0,0 +1,49 @@
+from fastapi import UploadFile
+
+from app.entities.municipality import MunicipalityDatasetOutDTO
+from app.services.get_report_info_service import GetReportInfoService
+from app.utils.database import db
+from app.utils.municipality_index import MunicipalityIndex, municipality_indexes
+from app.utils.workbook_schema import MUNICIPIOS_SCHEMA
+
+
+class RegisterMunicipalityDatasetService:
+    def __init__(self):
+        self.db = db
+        self.get_report_info_service = GetReportInfoService()
+
+    def execute(self, file: UploadFile) -> MunicipalityDatasetOutDTO:
+        self.get_report_info_service.raise_if_file_is_invalid(file)
+        self.get_report_info_service.validate_schema(file, MUNICIPIOS_SCHEMA)
+        dataset_id = self.get_report_info_service.file_digest(file)
+        sheets = self.get_report_info_service.load_sheets(file, dataset_id)
+        index = municipality_indexes.get_or_build(
+            dataset_id, lambda: MunicipalityIndex.from_dataframe(sheets["MQI_Municipios_CGPLAD"])
+        )
+
+        self.create_table_municipality_datasets_if_not_exists()
+        with self.db.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM municipality_datasets WHERE dataset_id = ?", (dataset_id,))
+            cursor.executemany(
+                "INSERT INTO municipality_datasets (dataset_id, uf, municipio, codigo_ibge) VALUES (?, ?, ?, ?)",
+                [(dataset_id, uf, municipio, codigo_ibge) for uf, municipio, codigo_ibge in index.entries]
+            )
+
+        return MunicipalityDatasetOutDTO(dataset_id=dataset_id, municipios=len(index.entries))
+
+    def create_table_municipality_datasets_if_not_exists(self):
+        with self.db.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """CREATE TABLE IF NOT EXISTS municipality_datasets (
+                    dataset_id TEXT NOT NULL,
+                    uf TEXT NOT NULL,
+                    municipio TEXT NOT NULL,
+                    codigo_ibge TEXT
+                );"""
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_municipality_datasets_dataset_id "
+                "ON municipality_datasets (dataset_id);"
+            )
@@ -1,13 +1,18 @@
 from app.entities.user import RegisterRequest
 from app.utils.database import db
-from passlib.context import CryptContext
 from fastapi import HTTPException, status
+from functools import cached_property
 
 
 class RegisterService:
     def __init__(self):
         self.db = db
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+    @cached_property
+    def pwd_context(self):
+        from passlib.context import CryptContext
+
+        return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
     def execute(self, register_request: RegisterRequest):
         self.__create_table_users_if_not_exists()
@@ -0,0 +1,114 @@
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Iterable, Iterator
+
+from app.entities.report import ReportInfoOutDTO
+from app.services.get_report_file_pdf_service import GetReportFilePdfService
+from app.utils.cache import NullCache
+from app.utils.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_worker_pdf_service: GetReportFilePdfService | None = None
+
+
+def _init_worker():
+    # Executado uma única vez por processo: o serviço e as fontes do reportlab são reaproveitados entre chunks
+    global _worker_pdf_service
+    # Os relatórios do lote acabaram de ser calculados (created_at novo), então o cache de PDFs nunca acertaria
+    _worker_pdf_service = GetReportFilePdfService(cache=NullCache())
+    _worker_pdf_service.warm_up()
+
+
+def _render_chunk(reports: list[ReportInfoOutDTO]) -> list[bytes | None]:
+    # Uma falha vira None só para o relatório afetado; o restante do chunk segue normalmente
+    pdfs = []
+    for report in reports:
+        try:
+            pdfs.append(_worker_pdf_service.render(report))
+        except Exception:
+            logger.exception("Falha ao renderizar PDF no pool")
+            pdfs.append(None)
+    return pdfs
+
+
+class RenderReportsPdfPoolService:
+    # O mesmo pool atende todos os /batch em andamento, cada um iterando numa thread do threadpool: criação e
+    # descarte do executor ficam sob lock, e o pool só é descartado quando quebra (worker morto)
+    def __init__(self, max_workers: int | None = None, chunksize: int | None = None):
+        self.max_workers = max_workers if max_workers is not None else settings.PDF_POOL_WORKERS
+        self.chunksize = chunksize if chunksize is not None else settings.PDF_POOL_CHUNKSIZE
+        self.__executor: ProcessPoolExecutor | None = None
+        self.__lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    @property
+    def window_size(self) -> int:
+        # Quantidade de relatórios em voo; limita a memória quando a entrada é um gerador
+        return self.max_workers * self.chunksize * 2
+
+    def execute(self, reports: Iterable[ReportInfoOutDTO]) -> Iterator[bytes | None]:
+        # Retorna None na posição de cada relatório que não pôde ser renderizado
+        pending: deque[tuple[Future, int, ProcessPoolExecutor]] = deque()
+        reports = iter(reports)
+        while chunk := list(islice(reports, self.chunksize)):
+            pending.append((*self.__submit(chunk), len(chunk)))
+            if len(pending) >= self.max_workers * 2:
+                yield from self.__result(*pending.popleft())
+        while pending:
+            yield from self.__result(*pending.popleft())
+
+    def shutdown(self):
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def __submit(self, chunk: list[ReportInfoOutDTO]) -> tuple[Future, ProcessPoolExecutor]:
+        executor = self.__get_executor()
+        try:
+            return executor.submit(_render_chunk, chunk), executor
+        except (BrokenProcessPool, RuntimeError):
+            # Outro stream descartou este pool entre obter e usar o executor; tenta uma vez no pool novo
+            self.__discard_executor(executor)
+            executor = self.__get_executor()
+            return executor.submit(_render_chunk, chunk), executor
+
+    def __result(self, future: Future, executor: ProcessPoolExecutor, size: int) -> list[bytes | None]:
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            # Um worker morreu: o pool é recriado para os próximos chunks
+            logger.exception("Pool de renderização de PDFs quebrado")
+            self.__discard_executor(executor)
+        except Exception:
+            logger.exception("Falha no pool de renderização de PDFs")
+        return [None] * size
+
+    def __discard_executor(self, executor: ProcessPoolExecutor):
+        # Só descarta se ainda for o executor atual, e sem cancelar futures: elas podem ser de outros streams
+        with self.__lock:
+            if self.__executor is not executor:
+                return
+            self.__executor = None
+        executor.shutdown(wait=False)
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        with self.__lock:
+            if self.__executor is None:
+                # forkserver/spawn: não herda, via fork, o estado das threads do servidor
+                start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self.__executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(start_method),
+                    initializer=_init_worker
+                )
+            return self.__executor
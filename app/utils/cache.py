@@ -0,0 +1,224 @@
+import hashlib
+import hmac
+import logging
+import os
+import socket
+import tempfile
+import threading
+from functools import lru_cache
+
+from app.utils.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Incrementar quando a forma de calcular relatórios/PDFs mudar, invalidando o que já está em cache
+CACHE_VERSION = 'v3'
+
+
+def cache_key(*parts: str | bytes) -> str:
+    digest = hashlib.sha256(CACHE_VERSION.encode())
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class CacheBackend:
+    # Quando False, os serviços nem calculam a chave: não há o que consultar
+    enabled = True
+
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    enabled = False
+
+    def get(self, key: str) -> bytes | None:
+        return None
+
+    def set(self, key: str, value: bytes) -> None:
+        pass
+
+
+class SignedCache(CacheBackend):
+    # Os backends são compartilhados (diretório do nó, memcached sem autenticação) e guardam pickles: cada valor
+    # leva um HMAC da chave + conteúdo, e o que não confere é descartado como cache miss
+    DIGEST_SIZE = hashlib.sha256().digest_size
+
+    def __init__(self, backend: CacheBackend, secret: str | bytes):
+        self.backend = backend
+        self.secret = secret if isinstance(secret, bytes) else secret.encode('utf-8')
+
+    def get(self, key: str) -> bytes | None:
+        signed = self.backend.get(key)
+        if signed is None or len(signed) < self.DIGEST_SIZE:
+            return None
+        signature, value = signed[:self.DIGEST_SIZE], signed[self.DIGEST_SIZE:]
+        if not hmac.compare_digest(signature, self.__sign(key, value)):
+            logger.warning("Assinatura inválida no cache para a chave %s", key)
+            return None
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        self.backend.set(key, self.__sign(key, value) + value)
+
+    def __sign(self, key: str, value: bytes) -> bytes:
+        return hmac.new(self.secret, key.encode('utf-8') + b'\0' + value, hashlib.sha256).digest()
+
+
+class DiskCache(CacheBackend):
+    # Compartilhado por todos os workers do nó: escrita atômica via os.replace e remoção dos itens menos usados
+    # quando o diretório passa de max_bytes. Falhas de disco viram cache miss.
+    LOW_WATER = 0.8
+    # O tamanho real do diretório é reconferido a cada SCAN_INTERVAL * max_bytes gravados por este processo (ou
+    # quando a estimativa passa do limite), então o que os outros workers gravaram também entra na conta e o
+    # excesso sobre max_bytes fica limitado a SCAN_INTERVAL * max_bytes por worker
+    SCAN_INTERVAL = 0.05
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.__make_private_dir(self.directory)
+        self.__lock = threading.Lock()
+        self.__size = 0
+        self.__unscanned = 0
+        self.__evict()
+
+    def get(self, key: str) -> bytes | None:
+        path = self.__path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read()
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return None
+        except OSError:
+            logger.warning("Falha ao ler o cache em disco", exc_info=True)
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        path = self.__path(key)
+        tmp_path = None
+        try:
+            self.__make_private_dir(os.path.dirname(path))
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value)
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.warning("Falha ao gravar no cache em disco", exc_info=True)
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except FileNotFoundError:
+                    pass
+            return
+        with self.__lock:
+            self.__size += len(value)
+            self.__unscanned += len(value)
+            if self.__size > self.max_bytes or self.__unscanned >= self.max_bytes * self.SCAN_INTERVAL:
+                self.__evict()
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    @staticmethod
+    def __make_private_dir(directory: str):
+        # O diretório padrão fica em /tmp: só aceita um diretório do próprio usuário e sem acesso para os demais
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        stat = os.stat(directory)
+        if hasattr(os, 'getuid') and stat.st_uid != os.getuid():
+            raise PermissionError(f'Diretório de cache {directory} pertence a outro usuário')
+        if stat.st_mode & 0o077:
+            os.chmod(directory, 0o700)
+
+    def __scan(self) -> tuple[list[tuple[float, int, str]], int]:
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        return entries, total
+
+    def __evict(self):
+        # Remove até LOW_WATER * max_bytes, para que a próxima varredura não venha logo no set seguinte
+        try:
+            entries, total = self.__scan()
+            target = self.max_bytes * self.LOW_WATER
+            if total > self.max_bytes:
+                for _, size, path in sorted(entries):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                    total -= size
+                    if total <= target:
+                        break
+        except OSError:
+            logger.warning("Falha ao limpar o cache em disco", exc_info=True)
+            return
+        self.__size = total
+        self.__unscanned = 0
+
+
+class MemcachedCache(CacheBackend):
+    # Cliente mínimo do protocolo texto do memcached; qualquer falha de rede é tratada como cache miss
+    def __init__(self, host: str, port: int, ttl: int = 0, timeout: float = 1.0):
+        self.address = (host, port)
+        self.ttl = ttl
+        self.timeout = timeout
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            with socket.create_connection(self.address, timeout=self.timeout) as conn:
+                conn.sendall(f'get {key}\r\n'.encode())
+                reader = conn.makefile('rb')
+                header = reader.readline()
+                if not header.startswith(b'VALUE '):
+                    return None
+                size = int(header.split()[3])
+                value = reader.read(size + 2)[:size]
+                return value if len(value) == size else None
+        except OSError:
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        try:
+            with socket.create_connection(self.address, timeout=self.timeout) as conn:
+                conn.sendall(f'set {key} 0 {self.ttl} {len(value)}\r\n'.encode() + value + b'\r\n')
+                conn.makefile('rb').readline()
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=None)
+def get_cache_backend() -> CacheBackend:
+    # Um backend por processo: todos os serviços compartilham a mesma instância (e a contagem de tamanho do disco)
+    if settings.CACHE_BACKEND not in ('disk', 'memcached'):
+        return NullCache()
+    if not settings.SECRET_KEY:
+        logger.warning("CACHE_BACKEND=%s exige SECRET_KEY para assinar o cache; cache desativado", settings.CACHE_BACKEND)
+        return NullCache()
+    if settings.CACHE_BACKEND == 'disk':
+        try:
+            backend = DiskCache(settings.CACHE_DIR, settings.CACHE_MAX_BYTES)
+        except OSError:
+            logger.warning("Diretório de cache %s indisponível; cache desativado", settings.CACHE_DIR, exc_info=True)
+            return NullCache()
+    else:
+        host, _, port = settings.CACHE_URL.partition(':')
+        backend = MemcachedCache(host, int(port or 11211), ttl=settings.CACHE_TTL)
+    return SignedCache(backend, settings.SECRET_KEY)
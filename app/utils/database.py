@@ -2,6 +2,8 @@ import os
 import sqlite3
 from contextlib import contextmanager
 
+from app.utils.settings import settings
+
 
 class Database:
     def __init__(self, db_path: str = "reports.db"):
@@ -20,4 +22,4 @@ class Database:
             conn.close()
 
 
-db = Database()
+db = Database(settings.DATABASE_PATH)
@@ -0,0 +1,132 @@
+import difflib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict, defaultdict
+from typing import Callable, Iterable
+
+STOPWORDS = {"D", "DA", "DAS", "DE", "DO", "DOS", "E"}
+
+
+def normalize(text: str) -> str:
+    normalized_text = unicodedata.normalize('NFD', str(text))
+    text = ''.join(char for char in normalized_text if unicodedata.category(char) != 'Mn').upper()
+    return ' '.join(re.sub(r'[^A-Z0-9]+', ' ', text).split())
+
+
+def tokens_key(text: str) -> str:
+    return ' '.join(token for token in normalize(text).split() if token not in STOPWORDS)
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class MunicipalityIndex:
+    # Resolve "UF|Município" para o nome canônico da planilha MQI_Municipios_CGPLAD: primeiro por nome normalizado
+    # (sem acentos, caixa ou pontuação), depois por tokens sem preposições e por código IBGE. O índice de trigramas
+    # usado nas sugestões só é montado na primeira busca sem correspondência
+    def __init__(self, entries: Iterable[tuple[str, str, str | None]]):
+        self.entries = [(str(uf).strip().upper(), str(municipio), codigo_ibge) for uf, municipio, codigo_ibge in entries]
+        self.__by_name: dict[tuple[str, str], int] = {}
+        self.__by_tokens: dict[tuple[str, str], set[int]] = defaultdict(set)
+        self.__by_ibge: dict[str, int] = {}
+        self.__trigrams: dict[str, set[int]] | None = None
+        for position, (uf, municipio, codigo_ibge) in enumerate(self.entries):
+            self.__by_name.setdefault((uf, normalize(municipio)), position)
+            self.__by_tokens[(uf, tokens_key(municipio))].add(position)
+            if codigo_ibge:
+                self.__by_ibge[codigo_ibge] = position
+                self.__by_ibge.setdefault(codigo_ibge[:6], position)
+
+    @classmethod
+    def from_dataframe(cls, df_munic) -> 'MunicipalityIndex':
+        col_ibge = next((col for col in df_munic.columns if 'IBGE' in str(col).upper()), None)
+        codigos = df_munic[col_ibge] if col_ibge else [None] * len(df_munic)
+        return cls(
+            (uf, municipio, cls.__format_ibge(codigo))
+            for uf, municipio, codigo in zip(df_munic["UF"], df_munic["Município"], codigos)
+        )
+
+    def resolve(self, uf: str, municipio: str) -> str | None:
+        uf = uf.strip().upper()
+        municipio = municipio.strip()
+        if municipio.isdigit() and municipio in self.__by_ibge:
+            entry_uf, entry_municipio, _ = self.entries[self.__by_ibge[municipio]]
+            return entry_municipio if entry_uf == uf else None
+        position = self.__by_name.get((uf, normalize(municipio)))
+        if position is None:
+            candidates = self.__by_tokens.get((uf, tokens_key(municipio)), set())
+            position = next(iter(candidates)) if len(candidates) == 1 else None
+        return self.entries[position][1] if position is not None else None
+
+    def suggest(self, uf: str | None, municipio: str, limit: int = 5) -> list[tuple[str, str, float]]:
+        if self.__trigrams is None:
+            self.__build_trigrams()
+        uf = uf.strip().upper() if uf else None
+        query = normalize(municipio)
+        query_trigrams = trigrams(query)
+        shared = defaultdict(int)
+        for trigram in query_trigrams:
+            for position in self.__trigrams.get(trigram, ()):
+                shared[position] += 1
+
+        ranked = []
+        for position, count in shared.items():
+            entry_uf, entry_municipio, _ = self.entries[position]
+            if uf and entry_uf != uf:
+                continue
+            entry_name = normalize(entry_municipio)
+            dice = 2 * count / (len(query_trigrams) + len(trigrams(entry_name)))
+            ratio = difflib.SequenceMatcher(None, query, entry_name).ratio()
+            ranked.append((entry_uf, entry_municipio, round((dice + ratio) / 2, 4)))
+        ranked.sort(key=lambda suggestion: -suggestion[2])
+        return ranked[:limit]
+
+    def __build_trigrams(self):
+        # Montado à parte e publicado de uma vez: o índice é compartilhado entre threads (ver MunicipalityIndexCache)
+        index = defaultdict(set)
+        for position, (_, municipio, _) in enumerate(self.entries):
+            for trigram in trigrams(normalize(municipio)):
+                index[trigram].add(position)
+        self.__trigrams = index
+
+    @staticmethod
+    def __format_ibge(codigo) -> str | None:
+        if codigo is None or codigo != codigo:
+            return None
+        codigo = str(codigo).strip()
+        codigo = codigo[:-2] if codigo.endswith('.0') else codigo
+        return codigo if codigo.isdigit() else None
+
+
+class MunicipalityIndexCache:
+    # Índices por digest do arquivo de origem, que também é o dataset_id de /datasets: o conteúdo de um digest nunca
+    # muda, então relatórios, cadastro e consulta de um mesmo arquivo reaproveitam o índice já montado no processo
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self.__indexes: OrderedDict[str, MunicipalityIndex] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get_or_build(self, digest: str, build: Callable[[], MunicipalityIndex]) -> MunicipalityIndex:
+        with self.__lock:
+            index = self.__indexes.get(digest)
+            if index is not None:
+                self.__indexes.move_to_end(digest)
+                return index
+        # Fora do lock: montagens concorrentes do mesmo digest dão índices iguais e a primeira a terminar fica
+        index = build()
+        with self.__lock:
+            index = self.__indexes.setdefault(digest, index)
+            self.__indexes.move_to_end(digest)
+            while len(self.__indexes) > self.maxsize:
+                self.__indexes.popitem(last=False)
+        return index
+
+    def clear(self):
+        with self.__lock:
+            self.__indexes.clear()
+
+
+municipality_indexes = MunicipalityIndexCache()
@@ -0,0 +1,7 @@
+from typing import Any
+
+import orjson
+
+
+def to_ndjson_line(data: Any) -> bytes:
+    return orjson.dumps(data, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
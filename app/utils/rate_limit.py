@@ -0,0 +1,176 @@
+import threading
+import time
+import weakref
+from typing import AsyncIterator, Iterator
+
+from fastapi import Depends, Request
+from starlette.datastructures import UploadFile
+
+from app.exceptions.rate_limit_exceeded_exception import RateLimitExceededException
+from app.exceptions.service_overloaded_exception import ServiceOverloadedException
+from app.utils.auth import get_current_user
+from app.utils.database import Database, db
+from app.utils.settings import settings
+
+
+class InMemoryRateLimiter:
+    # Token bucket por usuário, mantido no processo (cada worker do uvicorn tem o seu)
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.__buckets: dict[str, tuple[float, float]] = {}
+        self.__lock = threading.Lock()
+
+    def acquire(self, key: str) -> float:
+        # Retorna 0 se a requisição é permitida, ou quantos segundos esperar pelo próximo token
+        now = time.monotonic()
+        with self.__lock:
+            tokens, updated_at = self.__buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_per_second)
+            if tokens >= 1:
+                self.__buckets[key] = (tokens - 1, now)
+                return 0
+            self.__buckets[key] = (tokens, now)
+            return (1 - tokens) / self.refill_per_second
+
+
+class SqliteRateLimiter:
+    # Mesmo algoritmo, com os buckets no SQLite para serem compartilhados pelos workers do nó
+    def __init__(self, capacity: float, refill_per_second: float, database: Database):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.db = database
+        self.__table_created = False
+
+    def acquire(self, key: str) -> float:
+        self.__create_table_rate_limit_buckets_if_not_exists()
+        now = time.time()
+        with self.db.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,))
+            row = cursor.fetchone()
+            tokens, updated_at = row if row else (self.capacity, now)
+            tokens = min(self.capacity, tokens + max(0.0, now - updated_at) * self.refill_per_second)
+            retry_after = 0 if tokens >= 1 else (1 - tokens) / self.refill_per_second
+            if tokens >= 1:
+                tokens -= 1
+            cursor.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                (key, tokens, now)
+            )
+        return retry_after
+
+    def __create_table_rate_limit_buckets_if_not_exists(self):
+        if self.__table_created:
+            return
+        with self.db.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );"""
+            )
+        self.__table_created = True
+
+
+class AdmissionController:
+    # Limita, por worker, os bytes de upload em processamento e a quantidade de jobs pesados simultâneos.
+    # Um job sozinho é sempre admitido, mesmo maior que o limite, para que arquivos grandes não fiquem bloqueados
+    def __init__(self, max_inflight_bytes: int, max_heavy_jobs: int):
+        self.max_inflight_bytes = max_inflight_bytes
+        self.max_heavy_jobs = max_heavy_jobs
+        self.inflight_bytes = 0
+        self.heavy_jobs = 0
+        self.__lock = threading.Lock()
+
+    def admit(self, size: int) -> bool:
+        with self.__lock:
+            if self.heavy_jobs and (
+                    self.heavy_jobs >= self.max_heavy_jobs or self.inflight_bytes + size > self.max_inflight_bytes
+            ):
+                return False
+            self.heavy_jobs += 1
+            self.inflight_bytes += size
+            return True
+
+    def release(self, size: int):
+        with self.__lock:
+            self.heavy_jobs -= 1
+            self.inflight_bytes -= size
+
+
+def get_rate_limiter() -> InMemoryRateLimiter | SqliteRateLimiter:
+    if settings.RATE_LIMIT_BACKEND == 'sqlite':
+        return SqliteRateLimiter(settings.RATE_LIMIT_CAPACITY, settings.RATE_LIMIT_REFILL_PER_SECOND, db)
+    return InMemoryRateLimiter(settings.RATE_LIMIT_CAPACITY, settings.RATE_LIMIT_REFILL_PER_SECOND)
+
+
+rate_limiter = get_rate_limiter()
+admission_controller = AdmissionController(settings.ADMISSION_MAX_INFLIGHT_BYTES, settings.ADMISSION_MAX_HEAVY_JOBS)
+
+
+def rate_limit(user_id: str = Depends(get_current_user)):
+    retry_after = rate_limiter.acquire(user_id)
+    if retry_after:
+        raise RateLimitExceededException(retry_after)
+
+
+class AdmissionTicket:
+    # Vaga obtida em admission_control. Em respostas em streaming o corpo roda depois que a dependência termina,
+    # então o endpoint passa o iterador por wrap() e a vaga só é liberada quando o streaming acaba
+    def __init__(self, controller: AdmissionController, size: int):
+        self.controller = controller
+        self.size = size
+        self.deferred = False
+        self.__released = False
+        self.__lock = threading.Lock()
+
+    def wrap(self, iterator: Iterator[bytes]) -> Iterator[bytes]:
+        self.deferred = True
+        wrapped = self.__iterate(iterator)
+        # Se o corpo nunca começar a ser enviado (ex.: cliente desconectou), libera quando o gerador for descartado
+        weakref.finalize(wrapped, self.release)
+        return wrapped
+
+    def release(self):
+        with self.__lock:
+            if self.__released:
+                return
+            self.__released = True
+        self.controller.release(self.size)
+
+    def __iterate(self, iterator: Iterator[bytes]) -> Iterator[bytes]:
+        try:
+            yield from iterator
+        finally:
+            self.release()
+
+
+async def received_bytes(request: Request) -> int:
+    # Sem Content-Length (upload chunked) conta o que de fato chegou: o FastAPI já leu o corpo antes das
+    # dependências, então form()/body() devolvem o que está em cache na requisição
+    content_length = request.headers.get('content-length', '')
+    if content_length.isdigit():
+        return int(content_length)
+    if request.headers.get('content-type', '').startswith('multipart/form-data'):
+        form = await request.form()
+        return sum(
+            (value.size or 0) if isinstance(value, UploadFile) else len(value.encode('utf-8'))
+            for value in form.values()
+        )
+    return len(await request.body())
+
+
+async def admission_control(request: Request) -> AsyncIterator[AdmissionTicket]:
+    size = await received_bytes(request)
+    if not admission_controller.admit(size):
+        raise ServiceOverloadedException(settings.ADMISSION_RETRY_AFTER)
+    ticket = AdmissionTicket(admission_controller, size)
+    try:
+        yield ticket
+    finally:
+        if not ticket.deferred:
+            ticket.release()
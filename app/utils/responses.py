@@ -0,0 +1,13 @@
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class ReportJSONResponse(ORJSONResponse):
+    # Retornada diretamente pelas rotas, evita a validação do response_model que o FastAPI refaz em cada
+    # Section/Metric; relatórios já chegam como dicts e listas (ver report_info) e vão direto para o orjson
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            content = content.model_dump()
+        return super().render(content)
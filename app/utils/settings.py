@@ -1,4 +1,6 @@
+import json
 import os
+import tempfile
 
 from dotenv import load_dotenv
 
@@ -7,6 +9,22 @@ load_dotenv()
 
 class Settings:
     SECRET_KEY = os.getenv('SECRET_KEY')
+    DATABASE_PATH = os.getenv('DATABASE_PATH', 'reports.db')
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'none')
+    CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'reports-cache'))
+    CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+    CACHE_URL = os.getenv('CACHE_URL', '127.0.0.1:11211')
+    CACHE_TTL = int(os.getenv('CACHE_TTL', '0'))
+    WARM_UP_ON_STARTUP = os.getenv('WARM_UP_ON_STARTUP', 'true').lower() == 'true'
+    PDF_POOL_WORKERS = int(os.getenv('PDF_POOL_WORKERS', '0'))
+    PDF_POOL_CHUNKSIZE = int(os.getenv('PDF_POOL_CHUNKSIZE', '4'))
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_CAPACITY = float(os.getenv('RATE_LIMIT_CAPACITY', '30'))
+    RATE_LIMIT_REFILL_PER_SECOND = float(os.getenv('RATE_LIMIT_REFILL_PER_SECOND', '0.5'))
+    ADMISSION_MAX_INFLIGHT_BYTES = int(os.getenv('ADMISSION_MAX_INFLIGHT_BYTES', str(256 * 1024 * 1024)))
+    ADMISSION_MAX_HEAVY_JOBS = int(os.getenv('ADMISSION_MAX_HEAVY_JOBS', '4'))
+    ADMISSION_RETRY_AFTER = float(os.getenv('ADMISSION_RETRY_AFTER', '5'))
+    WORKBOOK_HEADER_ALIASES = json.loads(os.getenv('WORKBOOK_HEADER_ALIASES', '{}'))
 
 
 settings = Settings()
@@ -0,0 +1,19 @@
+import importlib
+
+from app.services.get_report_file_pdf_service import GetReportFilePdfService
+
+HEAVY_MODULES = [
+    'pandas',
+    'openpyxl',
+    'reportlab.pdfgen.canvas',
+    'passlib.context',
+    'passlib.handlers.bcrypt',
+    'jose.jwt',
+]
+
+
+def warm_up():
+    # Carrega de antemão os módulos importados sob demanda, para que a primeira requisição não pague esse custo
+    for module in HEAVY_MODULES:
+        importlib.import_module(module)
+    GetReportFilePdfService().warm_up()
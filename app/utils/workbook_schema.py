@@ -0,0 +1,110 @@
+import re
+from io import BytesIO
+from typing import Iterable
+
+from app.exceptions.invalid_file_type_exception import InvalidFileTypeException
+from app.exceptions.invalid_workbook_schema_exception import InvalidWorkbookSchemaException
+from app.utils.settings import settings
+
+# Planilhas e colunas lidas por cada tipo de relatório. Os nomes são os canônicos usados no código; cabeçalhos
+# equivalentes (espaços diferentes ou aliases) são renomeados para eles na leitura da planilha
+REGIONAL_SCHEMA = {
+    "MQI_Municipios_CGPLAD": [
+        "UF", "Região", "Município", "População 2021", "Total de vagas ocupadas",
+        "Potencial de cobertura da população pelo Programa ", "Categoria de IVS",
+    ],
+    "MQI_Monitoramento_PMMB": ["UF", "Municipio/DSEI", "STATUS", "ATIVA / INATIVA", "Financiamento"],
+}
+
+PROFISSIONAL_SCHEMA = {
+    "MQI_Municipios_CGPLAD": ["UF", "Município", "Total de vagas ocupadas"],
+    "MQI_Monitoramento_PMMB": [
+        "UF", "Municipio/DSEI", "CPF", "Nome do Médico ATIVO", "Ciclo", "Perfil do Médico", "Gênero", "Idade",
+        "Raça / cor", "Nacionalidade", "Início das Atividades", "Fim das Atividades", "Oferta Formativa",
+        "Instituição de Ensino Superior\nque o Profissional está Vinculado",
+    ],
+    "LOG_Maav": ["CPF", "FOI PARA O MAAv?"],
+    "ERA_Erario": ["CPF", "NECESSÁRIA RESTITUIÇÃO? S/N"],
+    "LIC_Licencas_Medicas": ["CPF", "INICIO DA LICENÇA MÉDICA", "TERMINO DA LICENÇA MÉDICA"],
+    "LIC_Matern_Patern": ["CPF", "Tipo de Licença", "INÍCIO DA LICENÇA"],
+    "PED_AvaliaMaisMedicos": ["CPF (Médico)", "Tipo Avaliação", "Nota Final"],
+    "NGA_ProcessosCGPP": ["CPF", "CATEGORIA", "CAUSA 1", "CAUSA 2", "CAUSA 3"],
+}
+
+MUNICIPIOS_SCHEMA = {
+    "MQI_Municipios_CGPLAD": ["UF", "Município"],
+}
+
+# Expressões regulares (casadas com o cabeçalho inteiro) aceitas no lugar de cada coluna canônica
+HEADER_ALIASES = {
+    "Oferta Formativa": [r"Oferta Formativa(\s+Atual.*)?"],
+    **settings.WORKBOOK_HEADER_ALIASES,
+}
+
+
+def schema_for(filter_type: str) -> dict[str, list[str]]:
+    return REGIONAL_SCHEMA if filter_type == 'REGIONAL' else PROFISSIONAL_SCHEMA
+
+
+def merge_schemas(schemas: Iterable[dict[str, list[str]]]) -> dict[str, list[str]]:
+    merged = {}
+    for schema in schemas:
+        for sheet_name, columns in schema.items():
+            merged.setdefault(sheet_name, [])
+            merged[sheet_name] += [column for column in columns if column not in merged[sheet_name]]
+    return merged
+
+
+def read_headers(contents: bytes) -> dict[str, list]:
+    # Modo read_only: só a primeira linha de cada aba é lida, sem carregar os dados
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(BytesIO(contents), read_only=True)
+    except Exception:
+        raise InvalidFileTypeException
+    try:
+        return {
+            worksheet.title: list(next(worksheet.iter_rows(max_row=1, values_only=True), ()))
+            for worksheet in workbook.worksheets
+        }
+    finally:
+        workbook.close()
+
+
+def canonical_columns(sheet_name: str, columns: Iterable) -> dict[str, str]:
+    columns = list(columns)
+    expected = merge_schemas([REGIONAL_SCHEMA, PROFISSIONAL_SCHEMA]).get(sheet_name, [])
+    renames = {}
+    for column in columns:
+        if not isinstance(column, str) or column in expected:
+            continue
+        canonical = next((name for name in expected if _header_matches(column, name)), None)
+        if canonical is not None and canonical not in columns and canonical not in renames.values():
+            renames[column] = canonical
+    return renames
+
+
+def validate_headers(headers: dict[str, list], schema: dict[str, list[str]]):
+    missing_sheets = [sheet_name for sheet_name in schema if sheet_name not in headers]
+    missing_columns = {}
+    for sheet_name, columns in schema.items():
+        if sheet_name not in headers:
+            continue
+        present = set(headers[sheet_name]) | set(canonical_columns(sheet_name, headers[sheet_name]).values())
+        missing = [column for column in columns if column not in present]
+        if missing:
+            missing_columns[sheet_name] = missing
+    if missing_sheets or missing_columns:
+        raise InvalidWorkbookSchemaException(missing_sheets, missing_columns)
+
+
+def _normalize_header(header: str) -> str:
+    return ' '.join(header.split()).casefold()
+
+
+def _header_matches(header: str, canonical: str) -> bool:
+    if _normalize_header(header) == _normalize_header(canonical):
+        return True
+    return any(re.fullmatch(pattern, header.strip(), flags=re.IGNORECASE | re.DOTALL)
+               for pattern in HEADER_ALIASES.get(canonical, []))
@@ -0,0 +1,59 @@
+"""
+Compara a renderização sequencial de PDFs com o pool de processos.
+
+Uso: python -m benchmarks.bench_pdf_pool --reports 400 --workers 1 2 4 --chunksize 4
+"""
+import argparse
+import os
+import time
+
+from app.entities.report import ReportInfoOutDTO, Section, Metric
+from app.services.get_report_file_pdf_service import GetReportFilePdfService
+from app.services.render_reports_pdf_pool_service import RenderReportsPdfPoolService
+
+
+def build_reports(quantidade: int) -> list[ReportInfoOutDTO]:
+    return [
+        ReportInfoOutDTO(
+            title='Relatório do(a) Médico(a)',
+            sections=[
+                Section(name=f'Seção {secao}', metrics=[
+                    Metric(metric=f'Métrica {metrica}', value=f'Valor {i} ' * (metrica + 1))
+                    for metrica in range(8)
+                ])
+                for secao in range(8)
+            ]
+        )
+        for i in range(quantidade)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--reports', type=int, default=400)
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument('--chunksize', type=int, default=4)
+    args = parser.parse_args()
+
+    reports = build_reports(args.reports)
+
+    service = GetReportFilePdfService()
+    service.warm_up()
+    start = time.perf_counter()
+    for report in reports:
+        service.render(report)
+    sequencial = time.perf_counter() - start
+    print(f'sequencial: {args.reports / sequencial:8.1f} relatórios/s')
+
+    for workers in args.workers:
+        pool = RenderReportsPdfPoolService(max_workers=workers, chunksize=args.chunksize)
+        list(pool.execute(reports[:workers]))  # sobe os processos antes de medir
+        start = time.perf_counter()
+        total = sum(1 for _ in pool.execute(reports))
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+        print(f'{workers:2d} workers: {total / elapsed:8.1f} relatórios/s (speedup {sequencial / elapsed:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
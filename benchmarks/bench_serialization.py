@@ -0,0 +1,98 @@
+"""
+Compara o custo por resposta de um relatório grande, da montagem das seções ao corpo serializado, em três caminhos:
+/generic (Section/Metric validados e response_model, que revalida tudo e serializa com o encoder padrão), /models
+(os mesmos modelos entregues ao ReportJSONResponse) e /plain (dicts de report_info/section/metric, usados hoje pelo
+serviço). As requisições são enviadas direto à aplicação ASGI, sem o overhead do TestClient.
+
+Uso: python -m benchmarks.bench_serialization --sections 12 --metrics 40 --requests 500
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+import orjson
+from fastapi import FastAPI
+
+from app.entities.report import ReportInfoOutDTO, Section, Metric, metric, report_info, section
+from app.utils.responses import ReportJSONResponse
+
+
+def raw_values(sections: int, metrics: int) -> list[list[tuple[str, object]]]:
+    # Mistura o que o serviço produz: textos formatados, contagens do pandas (numpy) e inteiros do Python
+    valores = (lambda i: f'Total: {i} ({i / 8:.2f}%)', np.int64, np.float64, int)
+    return [
+        [(f'Métrica {metrica}', valores[metrica % len(valores)](metrica)) for metrica in range(metrics)]
+        for _ in range(sections)
+    ]
+
+
+async def call(app: FastAPI, path: str) -> bytes:
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+             'path': path, 'raw_path': path.encode(), 'root_path': '', 'query_string': b'', 'headers': [],
+             'client': ('127.0.0.1', 0), 'server': ('127.0.0.1', 80)}
+    body = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.body':
+            body.append(message.get('body', b''))
+
+    await app(scope, receive, send)
+    return b''.join(body)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sections', type=int, default=12)
+    parser.add_argument('--metrics', type=int, default=40)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    raw = raw_values(args.sections, args.metrics)
+    app = FastAPI()
+
+    def build_model() -> ReportInfoOutDTO:
+        return ReportInfoOutDTO(title='Relatório do(a) Médico(a)', sections=[
+            Section(name=f'Seção {secao}', metrics=[Metric(metric=nome, value=valor) for nome, valor in metricas])
+            for secao, metricas in enumerate(raw)
+        ])
+
+    @app.get('/generic')
+    def generic() -> ReportInfoOutDTO:
+        return build_model()
+
+    @app.get('/models', response_model=ReportInfoOutDTO, response_class=ReportJSONResponse)
+    def models():
+        return ReportJSONResponse(build_model())
+
+    @app.get('/plain', response_model=ReportInfoOutDTO, response_class=ReportJSONResponse)
+    def plain():
+        return ReportJSONResponse(report_info(title='Relatório do(a) Médico(a)', sections=[
+            section(name=f'Seção {secao}', metrics=[metric(metric=nome, value=valor) for nome, valor in metricas])
+            for secao, metricas in enumerate(raw)
+        ]))
+
+    async def run():
+        paths = ('/generic', '/models', '/plain')
+        bodies = [orjson.loads(await call(app, path)) for path in paths]
+        for body in bodies:
+            del body['created_at']
+        assert bodies[0] == bodies[1] == bodies[2]
+
+        elapsed = {}
+        for path in paths:
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                await call(app, path)
+            elapsed[path] = (time.perf_counter() - start) / args.requests
+        for path in paths:
+            print(f'{path:<9} {elapsed[path] * 1000:6.3f} ms/resposta ({elapsed["/generic"] / elapsed[path]:.1f}x)')
+
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
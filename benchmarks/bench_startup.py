@@ -0,0 +1,79 @@
+"""
+Mede o tempo de importação de `main` (custo pago por cada worker do uvicorn antes de subir), o tempo do warm-up
+e o time-to-ready: do início do processo do uvicorn até a primeira resposta HTTP, com e sem WARM_UP_ON_STARTUP.
+
+Uso: python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.load_test import ROOT, free_port
+
+SNIPPET = '''
+import time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from app.utils.warmup import warm_up
+warm_up()
+print(imported - start, time.perf_counter() - imported)
+'''
+
+
+def time_to_ready(env: dict[str, str], timeout: float = 60) -> float:
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', str(port),
+         '--log-level', 'warning'],
+        cwd=ROOT, env=env
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/docs/openapi.json', timeout=1):
+                    return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise RuntimeError('Servidor não respondeu a tempo')
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, 'SECRET_KEY': os.environ.get('SECRET_KEY', 'benchmark'),
+               'DATABASE_PATH': os.path.join(tmp, 'reports.db')}
+        imports, warm_ups = [], []
+        for _ in range(args.runs):
+            output = subprocess.run([sys.executable, '-c', SNIPPET], env=env, cwd=ROOT, capture_output=True,
+                                    text=True, check=True)
+            import_time, warm_up_time = map(float, output.stdout.split())
+            imports.append(import_time)
+            warm_ups.append(warm_up_time)
+        ready = {
+            flag: [time_to_ready({**env, 'WARM_UP_ON_STARTUP': flag}) for _ in range(args.runs)]
+            for flag in ('false', 'true')
+        }
+
+    print(f'import main: mediana {statistics.median(imports) * 1000:7.1f} ms (min {min(imports) * 1000:.1f} ms)')
+    print(f'warm-up:     mediana {statistics.median(warm_ups) * 1000:7.1f} ms (min {min(warm_ups) * 1000:.1f} ms)')
+    for flag, values in ready.items():
+        print(f'time-to-ready (WARM_UP_ON_STARTUP={flag}): mediana {statistics.median(values) * 1000:7.1f} ms '
+              f'(min {min(values) * 1000:.1f} ms)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""
+Teste de carga local: sobe `main:app` com um reports.db temporário, faz login por /api/users/login e dispara
+requisições em /api/reports/info e /api/reports/pdf com planilhas sintéticas.
+
+Ao final mostra, por endpoint, latências p50/p95/p99, vazão e taxa de erro, além do pico de RSS de cada worker.
+
+Uso: python -m benchmarks.load_test --workers 4 --concurrency 16 --requests 400 --professionals 2000
+     (--workers 0 roda o servidor em uma thread deste mesmo processo)
+"""
+import argparse
+import os
+import random
+import secrets
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.synthetic_workbook import UFS, build_workbook, cpfs, municipios
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+EMAIL = 'loadtest@example.com'
+PASSWORD = 'loadtest'
+
+
+def create_database(path: str):
+    from passlib.context import CryptContext
+
+    hashed_password = CryptContext(schemes=["bcrypt"], deprecated="auto").hash(PASSWORD)
+    with sqlite3.connect(path) as conn:
+        with open(os.path.join(ROOT, 'database.sql')) as f:
+            conn.executescript(f.read())
+        conn.execute("INSERT INTO users (nome, email, hashed_password) VALUES (?, ?, ?)",
+                     ('Load test', EMAIL, hashed_password))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class LocalServer:
+    def __init__(self, workers: int, env: dict[str, str]):
+        self.workers = workers
+        self.env = env
+        self.port = free_port()
+        self.base_url = f'http://127.0.0.1:{self.port}'
+        self.process = None
+        self.server = None
+
+    def __enter__(self):
+        if self.workers == 0:
+            os.environ.update(self.env)
+            import uvicorn
+            from main import app
+
+            self.server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=self.port, log_level='warning'))
+            threading.Thread(target=self.server.run, daemon=True).start()
+        else:
+            self.process = subprocess.Popen(
+                [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', str(self.port),
+                 '--workers', str(self.workers), '--log-level', 'warning'],
+                cwd=ROOT, env={**os.environ, **self.env}
+            )
+        self.__wait_until_ready()
+        return self
+
+    def __exit__(self, *exc):
+        if self.server is not None:
+            self.server.should_exit = True
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait(timeout=30)
+
+    def pids(self) -> list[int]:
+        # Com um worker o uvicorn atende no próprio processo; com mais, os workers são filhos criados pelo
+        # multiprocessing (spawn), e os demais filhos, como o resource_tracker, não entram na conta
+        if self.process is None:
+            return [os.getpid()]
+        if self.workers == 1:
+            return [self.process.pid]
+        workers = []
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+                if ppid != self.process.pid:
+                    continue
+                with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                    cmdline = f.read().split(b'\0')
+            except (OSError, IndexError, ValueError):
+                continue
+            if b'--multiprocessing-fork' in cmdline:
+                workers.append(int(entry))
+        return workers
+
+    def __wait_until_ready(self, timeout: float = 60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if requests.get(f'{self.base_url}/api/docs/openapi.json', timeout=1).ok:
+                    return
+            except requests.ConnectionError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError('Servidor não respondeu a tempo')
+
+
+class RssSampler(threading.Thread):
+    def __init__(self, server: LocalServer, interval: float = 0.2):
+        super().__init__(daemon=True)
+        self.server = server
+        self.interval = interval
+        self.peaks: dict[int, int] = {}
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            for pid in self.server.pids():
+                try:
+                    with open(f'/proc/{pid}/status') as f:
+                        rss_kb = next(int(line.split()[1]) for line in f if line.startswith('VmRSS:'))
+                except (OSError, StopIteration):
+                    continue
+                self.peaks[pid] = max(self.peaks.get(pid, 0), rss_kb)
+            self.stopped.wait(self.interval)
+
+
+def percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--professionals', type=int, default=2000)
+    parser.add_argument('--pdf-ratio', type=float, default=0.5, help='fração das requisições feitas em /pdf')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--keep-rate-limit', action='store_true',
+                        help='mantém o limite por usuário configurado (por padrão é desligado, pois há um só usuário)')
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workbook_path = os.path.join(tmp, 'planilha.xlsx')
+        build_workbook(workbook_path, args.professionals, args.seed)
+        with open(workbook_path, 'rb') as f:
+            workbook = f.read()
+        database_path = os.path.join(tmp, 'reports.db')
+        create_database(database_path)
+
+        env = {'DATABASE_PATH': database_path, 'SECRET_KEY': secrets.token_hex(16)}
+        if not args.keep_rate_limit:
+            env['RATE_LIMIT_CAPACITY'] = str(10 ** 9)
+        with LocalServer(args.workers, env) as server:
+            session = requests.Session()
+            login = session.post(f'{server.base_url}/api/users/login', json={'email': EMAIL, 'password': PASSWORD})
+            login.raise_for_status()
+            headers = {'Authorization': f'Bearer {login.json()["access_token"]}'}
+
+            def random_filters() -> dict[str, str]:
+                if rng.random() < 0.5:
+                    uf = rng.choice(list(UFS))
+                    return {'filter_type': 'REGIONAL', 'value': f'{uf}|{rng.choice(municipios(uf))}'}
+                return {'filter_type': 'PROFISSIONAL', 'value': rng.choice(cpfs(args.professionals))}
+
+            sample_report = session.post(f'{server.base_url}/api/reports/info', headers=headers,
+                                         files={'file': ('planilha.xlsx', workbook, XLSX_CONTENT_TYPE)},
+                                         data=random_filters()).json()
+
+            def call(endpoint: str, filters: dict[str, str] | None) -> tuple[str, float, int]:
+                start = time.perf_counter()
+                try:
+                    if endpoint == 'pdf':
+                        response = requests.post(f'{server.base_url}/api/reports/pdf', headers=headers,
+                                                 json=sample_report)
+                    else:
+                        response = requests.post(f'{server.base_url}/api/reports/info', headers=headers,
+                                                 files={'file': ('planilha.xlsx', workbook, XLSX_CONTENT_TYPE)},
+                                                 data=filters)
+                    status_code = response.status_code
+                except requests.RequestException:
+                    status_code = 0
+                return endpoint, time.perf_counter() - start, status_code
+
+            # Sorteado antes de disparar as threads, para que a mesma --seed repita a mesma sequência de requisições
+            plan = [('pdf', None) if rng.random() < args.pdf_ratio else ('info', random_filters())
+                    for _ in range(args.requests)]
+            sampler = RssSampler(server)
+            sampler.start()
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+                results = list(executor.map(lambda item: call(*item), plan))
+            elapsed = time.perf_counter() - start
+            sampler.stopped.set()
+            sampler.join()
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    for endpoint, latency, status_code in results:
+        latencies[endpoint].append(latency)
+        # 404 é resposta válida para filtros sorteados sem correspondência na planilha
+        if status_code not in (200, 404):
+            errors[endpoint] += 1
+
+    print(f'{args.requests} requisições em {elapsed:.2f}s ({args.requests / elapsed:.1f} req/s), '
+          f'workers={args.workers}, concorrência={args.concurrency}')
+    for endpoint, values in sorted(latencies.items()):
+        print(f'  /{endpoint:<5} n={len(values):<5} '
+              f'p50={percentile(values, 50) * 1000:8.1f}ms '
+              f'p95={percentile(values, 95) * 1000:8.1f}ms '
+              f'p99={percentile(values, 99) * 1000:8.1f}ms '
+              f'vazão={len(values) / elapsed:7.1f} req/s '
+              f'erros={errors[endpoint] / len(values) * 100:.1f}%')
+    for pid, rss_kb in sorted(sampler.peaks.items()):
+        print(f'  worker {pid}: pico de RSS {rss_kb / 1024:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
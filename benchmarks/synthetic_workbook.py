@@ -0,0 +1,90 @@
+"""
+Gera planilhas sintéticas com todas as abas e colunas lidas pelos relatórios.
+
+Uso: python -m benchmarks.synthetic_workbook --professionals 2000 --output /tmp/planilha.xlsx
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+UFS = {'SP': 'Sudeste', 'MG': 'Sudeste', 'BA': 'Nordeste', 'PE': 'Nordeste', 'AM': 'Norte'}
+MUNICIPIOS_POR_UF = 20
+
+
+def municipios(uf: str) -> list[str]:
+    return [f'CIDADE {uf} {i}' for i in range(MUNICIPIOS_POR_UF)]
+
+
+def cpfs(professionals: int) -> list[str]:
+    return [str(10000000000 + i) for i in range(professionals)]
+
+
+def build_workbook(path: str, professionals: int, seed: int = 1):
+    rng = random.Random(seed)
+    df_munic = pd.DataFrame([
+        {
+            'UF': uf, 'Região': regiao, 'Município': municipio,
+            'População 2021': rng.randint(1_000, 500_000),
+            'Total de vagas ocupadas': rng.randint(0, 30),
+            'Potencial de cobertura da população pelo Programa ': rng.randint(0, 10_000),
+            'Categoria de IVS': rng.choice(['BAIXO', 'MÉDIO', 'ALTO']),
+        }
+        for uf, regiao in UFS.items() for municipio in municipios(uf)
+    ])
+
+    todos_cpfs = cpfs(professionals)
+    monitoramento = []
+    for i, cpf in enumerate(todos_cpfs):
+        uf = rng.choice(list(UFS))
+        monitoramento.append({
+            'UF': uf, 'Municipio/DSEI': rng.choice(municipios(uf)).title(), 'CPF': int(cpf),
+            'STATUS': rng.choice(['OCUPADA', 'DESOCUPADA']), 'ATIVA / INATIVA': rng.choice(['ATIVA', 'INATIVA']),
+            'Financiamento': rng.choice(['FEDERAL', 'MUNICIPAL']), 'Nome do Médico ATIVO': f'Médico {i}',
+            'Ciclo': rng.choice(['1º', '2º']), 'Perfil do Médico': rng.choice(['CRM', 'INTERCAMBISTA', 'RMS']),
+            'Gênero': rng.choice(['MASCULINO', 'FEMININO']), 'Idade': rng.randint(25, 70), 'Raça / cor': 'PARDA',
+            'Nacionalidade': 'BRASILEIRA', 'Início das Atividades': datetime(2023, 1, 1) + timedelta(days=i % 365),
+            'Fim das Atividades': datetime(2027, 1, 1) if i % 2 else datetime(2024, 6, 1),
+            'Oferta Formativa\nAtual 11/04/2025': 'ESPECIALIZAÇÃO',
+            'Instituição de Ensino Superior\nque o Profissional está Vinculado': 'UNIVERSIDADE FEDERAL',
+        })
+
+    def amostra(fracao: float) -> list[int]:
+        return [int(cpf) for cpf in rng.sample(todos_cpfs, int(len(todos_cpfs) * fracao))]
+
+    sheets = {
+        'MQI_Municipios_CGPLAD': df_munic,
+        'MQI_Monitoramento_PMMB': pd.DataFrame(monitoramento),
+        'LOG_Maav': pd.DataFrame({'CPF': amostra(0.3), 'FOI PARA O MAAv?': 'SIM'}),
+        'ERA_Erario': pd.DataFrame({'CPF': amostra(0.1), 'NECESSÁRIA RESTITUIÇÃO? S/N': 'SIM'}),
+        'LIC_Licencas_Medicas': pd.DataFrame({
+            'CPF': amostra(0.2), 'INICIO DA LICENÇA MÉDICA': datetime(2024, 2, 1),
+            'TERMINO DA LICENÇA MÉDICA': datetime(2024, 3, 1),
+        }),
+        'LIC_Matern_Patern': pd.DataFrame({
+            'CPF': amostra(0.1), 'Tipo de Licença': 'MATERNIDADE', 'INÍCIO DA LICENÇA': datetime(2024, 5, 1),
+        }),
+        'PED_AvaliaMaisMedicos': pd.DataFrame({
+            'CPF (Médico)': amostra(0.5), 'Tipo Avaliação': 'SUPERVISÃO', 'Nota Final': 8.5,
+        }),
+        'NGA_ProcessosCGPP': pd.DataFrame({
+            'CPF': amostra(0.05), 'CATEGORIA': 'ADMINISTRATIVO', 'CAUSA 1': 'AUSÊNCIA', 'CAUSA 2': '-', 'CAUSA 3': None,
+        }),
+    }
+    with pd.ExcelWriter(path) as writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--professionals', type=int, default=2000)
+    parser.add_argument('--output', required=True)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    build_workbook(args.output, args.professionals, args.seed)
+
+
+if __name__ == '__main__':
+    main()
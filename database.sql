@@ -4,3 +4,12 @@ CREATE TABLE IF NOT EXISTS users (
     email TEXT NOT NULL UNIQUE,
     hashed_password TEXT NOT NULL
 );
+
+CREATE TABLE IF NOT EXISTS municipality_datasets (
+    dataset_id TEXT NOT NULL,
+    uf TEXT NOT NULL,
+    municipio TEXT NOT NULL,
+    codigo_ibge TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_municipality_datasets_dataset_id ON municipality_datasets (dataset_id);
@@ -1,15 +1,31 @@
-from app.controllers import app_routers
+import threading
+from contextlib import asynccontextmanager
+
+from app.controllers import app_routers, reports_controller
+from app.utils.settings import settings
+from app.utils.warmup import warm_up
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 
 origins = ['*']
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if settings.WARM_UP_ON_STARTUP:
+        # Em segundo plano: o worker já aceita requisições enquanto os módulos pesados são carregados
+        threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
+    yield
+    reports_controller.generate_reports_batch_service.render_reports_pdf_pool_service.shutdown()
+
+
 api = FastAPI(title='Geração de relatórios em PDF',
               version='1.0.0',
               openapi_url='/api/docs/openapi.json',
               docs_url='/api/docs',
-              redoc_url='/api/redoc')
+              redoc_url='/api/redoc',
+              lifespan=lifespan)
 
 
 def create_app() -> FastAPI:
@@ -0,0 +1,145 @@
+import os
+import socketserver
+import stat
+import threading
+
+import pytest
+
+from app.utils.cache import DiskCache, MemcachedCache, NullCache, SignedCache, cache_key, get_cache_backend
+from app.utils.settings import settings
+
+
+class FakeMemcachedHandler(socketserver.StreamRequestHandler):
+    # Implementa só o necessário do protocolo texto: get e set
+    def handle(self):
+        while line := self.rfile.readline():
+            command, key, *args = line.split()
+            if command == b'get':
+                value = self.server.store.get(key)
+                if value is not None:
+                    self.wfile.write(b'VALUE %s 0 %d\r\n' % (key, len(value)) + value + b'\r\n')
+                self.wfile.write(b'END\r\n')
+            elif command == b'set':
+                self.server.store[key] = self.rfile.read(int(args[2]) + 2)[:-2]
+                self.wfile.write(b'STORED\r\n')
+
+
+@pytest.fixture
+def memcached_server():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), FakeMemcachedHandler)
+    server.store = {}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_cache_key_is_stable_and_separates_parts():
+    assert cache_key('a', 'b') == cache_key('a', b'b')
+    assert cache_key('ab', 'c') != cache_key('a', 'bc')
+
+
+def test_null_cache_is_disabled():
+    cache = NullCache()
+    cache.set('key', b'value')
+    assert not cache.enabled
+    assert cache.get('key') is None
+
+
+def test_memcached_round_trip(memcached_server):
+    cache = MemcachedCache(*memcached_server.server_address)
+    key = cache_key('report-info', 'x')
+    assert cache.get(key) is None
+    cache.set(key, b'\x00value\r\nwith binary')
+    assert cache.get(key) == b'\x00value\r\nwith binary'
+
+
+def test_memcached_unreachable_is_a_miss(memcached_server):
+    host, port = memcached_server.server_address
+    memcached_server.shutdown()
+    memcached_server.server_close()
+    cache = MemcachedCache(host, port, timeout=0.2)
+    cache.set('key', b'value')
+    assert cache.get('key') is None
+
+
+def test_disk_cache_round_trip_and_private_directory(tmp_path):
+    directory = tmp_path / 'cache'
+    directory.mkdir(mode=0o777)
+    os.chmod(directory, 0o777)
+    cache = DiskCache(str(directory), max_bytes=1024)
+    key = cache_key('sheets', 'x')
+    assert cache.get(key) is None
+    cache.set(key, b'value')
+    assert cache.get(key) == b'value'
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+
+
+def test_disk_cache_evicts_least_recently_used_below_limit(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1000)
+    keys = [cache_key('item', str(i)) for i in range(10)]
+    for age, key in enumerate(keys):
+        cache.set(key, b'x' * 150)
+        path = os.path.join(tmp_path, key[:2], key)
+        os.utime(path, (age, age))
+
+    remaining = [key for key in keys if cache.get(key) is not None]
+    assert 0 < len(remaining) * 150 <= 1000
+    assert remaining == keys[-len(remaining):]
+
+
+def directory_size(directory) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(directory) for name in files)
+
+
+def test_disk_cache_limit_holds_across_instances_on_the_same_directory(tmp_path):
+    caches = [DiskCache(str(tmp_path), max_bytes=1000) for _ in range(3)]
+    for i in range(60):
+        caches[i % 3].set(cache_key('item', str(i)), b'x' * 150)
+    assert directory_size(tmp_path) <= 1000 * (1 + DiskCache.SCAN_INTERVAL * 3)
+
+
+def test_get_cache_backend_is_shared_per_process(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'CACHE_BACKEND', 'disk')
+    monkeypatch.setattr(settings, 'CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(settings, 'SECRET_KEY', 'secret')
+    get_cache_backend.cache_clear()
+    try:
+        backend = get_cache_backend()
+        assert isinstance(backend, SignedCache)
+        assert get_cache_backend() is backend
+    finally:
+        get_cache_backend.cache_clear()
+
+
+def test_disk_cache_failures_are_misses(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+    key = cache_key('item', 'x')
+    os.makedirs(os.path.join(tmp_path, key[:2], key))
+    assert cache.get(key) is None
+
+    def disk_full(*args, **kwargs):
+        raise OSError(28, 'No space left on device')
+
+    monkeypatch.setattr('tempfile.mkstemp', disk_full)
+    cache.set(cache_key('item', 'y'), b'value')
+    assert cache.get(cache_key('item', 'y')) is None
+
+
+def test_signed_cache_rejects_tampered_and_foreign_entries(memcached_server):
+    backend = MemcachedCache(*memcached_server.server_address)
+    cache = SignedCache(backend, 'secret')
+    cache.set('a', b'value')
+    assert cache.get('a') == b'value'
+
+    backend.set('b', backend.get('a'))
+    assert cache.get('b') is None
+
+    signed = backend.get('a')
+    backend.set('a', signed[:-1] + b'X')
+    assert cache.get('a') is None
+
+    SignedCache(backend, 'other-secret').set('c', b'value')
+    assert cache.get('c') is None
+    backend.set('d', b'short')
+    assert cache.get('d') is None
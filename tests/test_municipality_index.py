@@ -0,0 +1,139 @@
+import pandas as pd
+import pytest
+
+from app.exceptions.locale_not_found_exception import LocaleNotFoundException
+from app.services.get_report_info_service import GetReportInfoService
+from app.utils.cache import NullCache
+from app.utils.municipality_index import (MunicipalityIndex, MunicipalityIndexCache, municipality_indexes, normalize,
+                                          tokens_key)
+
+ENTRIES = [
+    ('SP', 'SAO PAULO', '3550308'),
+    ('SP', 'SANTA BARBARA D OESTE', '3545803'),
+    ('SP', 'SAO JOSE DO RIO PRETO', '3549805'),
+    ('SP', 'SAO JOSE DOS CAMPOS', '3549904'),
+    ('RJ', 'RIO DE JANEIRO', '3304557'),
+    ('MG', 'SANTA RITA DE CALDAS', None),
+    ('MG', 'SANTA RITA DAS CALDAS', None),
+]
+
+
+@pytest.fixture
+def index():
+    return MunicipalityIndex(ENTRIES)
+
+
+@pytest.fixture(autouse=True)
+def clear_municipality_indexes():
+    municipality_indexes.clear()
+    yield
+    municipality_indexes.clear()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('São Paulo', 'SAO PAULO'),
+    ("  santa bárbara d'oeste ", 'SANTA BARBARA D OESTE'),
+    ('Embu-Guaçu', 'EMBU GUACU'),
+    (3550308, '3550308'),
+])
+def test_normalize_drops_accents_case_and_punctuation(text, expected):
+    assert normalize(text) == expected
+
+
+def test_tokens_key_drops_prepositions():
+    assert tokens_key('São José do Rio Preto') == tokens_key('SAO JOSE RIO PRETO') == 'SAO JOSE RIO PRETO'
+
+
+@pytest.mark.parametrize('uf, municipio, expected', [
+    ('sp', 'são paulo', 'SAO PAULO'),
+    ('SP', "Santa Bárbara d'Oeste", 'SANTA BARBARA D OESTE'),
+    ('SP', 'Sao Jose Rio Preto', 'SAO JOSE DO RIO PRETO'),
+    ('SP', '3550308', 'SAO PAULO'),
+    ('SP', '355030', 'SAO PAULO'),
+    ('RJ', 'Sao Paulo', None),
+    ('RJ', '3550308', None),
+    ('SP', 'Campinas', None),
+])
+def test_resolve(index, uf, municipio, expected):
+    assert index.resolve(uf, municipio) == expected
+
+
+def test_resolve_leaves_ambiguous_token_matches_unresolved(index):
+    assert index.resolve('MG', 'Santa Rita Caldas') is None
+    assert index.resolve('MG', 'Santa Rita das Caldas') == 'SANTA RITA DAS CALDAS'
+
+
+def test_suggest_ranks_closest_names_first(index):
+    suggestions = index.suggest('SP', 'Sao Jose dos Campo')
+
+    assert [municipio for _, municipio, _ in suggestions][:2] == ['SAO JOSE DOS CAMPOS', 'SAO JOSE DO RIO PRETO']
+    assert suggestions == sorted(suggestions, key=lambda suggestion: -suggestion[2])
+    assert all(uf == 'SP' for uf, _, _ in suggestions)
+
+
+def test_suggest_without_uf_searches_every_state_and_respects_limit(index):
+    suggestions = index.suggest(None, 'Rio de Janeiro', limit=2)
+
+    assert len(suggestions) == 2
+    assert suggestions[0] == ('RJ', 'RIO DE JANEIRO', 1.0)
+
+
+def test_from_dataframe_reads_ibge_codes_stored_as_floats():
+    df = pd.DataFrame({'UF': ['SP', 'SP'], 'Município': ['SAO PAULO', 'CAMPINAS'],
+                       'Código IBGE': [3550308.0, float('nan')]})
+
+    index = MunicipalityIndex.from_dataframe(df)
+
+    assert index.entries == [('SP', 'SAO PAULO', '3550308'), ('SP', 'CAMPINAS', None)]
+    assert index.resolve('SP', '3550308') == 'SAO PAULO'
+
+
+def test_index_cache_builds_once_per_digest_and_evicts_least_recently_used():
+    cache = MunicipalityIndexCache(maxsize=2)
+    builds = []
+
+    def build(name):
+        builds.append(name)
+        return MunicipalityIndex(ENTRIES)
+
+    first = cache.get_or_build('a', lambda: build('a'))
+    assert cache.get_or_build('a', lambda: build('a')) is first
+    cache.get_or_build('b', lambda: build('b'))
+    cache.get_or_build('a', lambda: build('a'))
+    cache.get_or_build('c', lambda: build('c'))
+    cache.get_or_build('a', lambda: build('a'))
+    cache.get_or_build('b', lambda: build('b'))
+
+    assert builds == ['a', 'b', 'c', 'b']
+
+
+def sheets():
+    return {'MQI_Municipios_CGPLAD': pd.DataFrame({
+        'UF': [uf for uf, _, _ in ENTRIES],
+        'Município': [municipio for _, municipio, _ in ENTRIES],
+        'Código IBGE': [codigo for _, _, codigo in ENTRIES],
+    })}
+
+
+def test_resolve_locale_reuses_the_index_of_the_same_file(monkeypatch):
+    service = GetReportInfoService(cache=NullCache())
+    built = []
+    from_dataframe = MunicipalityIndex.from_dataframe
+    monkeypatch.setattr(MunicipalityIndex, 'from_dataframe', lambda df: built.append(df) or from_dataframe(df))
+
+    assert service.resolve_locale(sheets(), 'SP|São Paulo', 'digest') == ('SP', 'SAO PAULO', 'São Paulo')
+    assert service.resolve_locale(sheets(), "SP|Santa Bárbara d'Oeste", 'digest')[1] == 'SANTA BARBARA D OESTE'
+    assert service.resolve_locale(sheets(), 'SP|3549904', 'digest')[1] == 'SAO JOSE DOS CAMPOS'
+    with pytest.raises(LocaleNotFoundException):
+        service.resolve_locale(sheets(), 'SP|Campinas', 'digest')
+
+    assert len(built) == 1
+
+
+def test_resolve_locale_reuses_a_registered_dataset_index(monkeypatch):
+    registered = municipality_indexes.get_or_build('dataset', lambda: MunicipalityIndex(ENTRIES))
+    monkeypatch.setattr(MunicipalityIndex, 'from_dataframe', pytest.fail)
+
+    assert GetReportInfoService(cache=NullCache()).resolve_locale(sheets(), 'RJ|Rio Janeiro', 'dataset')[1] == \
+        'RIO DE JANEIRO'
+    assert GetReportInfoService.municipality_index(sheets(), 'dataset') is registered
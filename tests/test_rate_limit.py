@@ -0,0 +1,137 @@
+import asyncio
+import gc
+
+import pytest
+from starlette.requests import Request
+
+from app.exceptions.service_overloaded_exception import ServiceOverloadedException
+from app.utils import rate_limit
+from app.utils.database import Database
+from app.utils.rate_limit import (AdmissionController, AdmissionTicket, InMemoryRateLimiter, SqliteRateLimiter,
+                                  admission_control)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, 'time', fake)
+    return fake
+
+
+@pytest.mark.parametrize('build', [
+    lambda tmp_path: InMemoryRateLimiter(capacity=2, refill_per_second=0.5),
+    lambda tmp_path: SqliteRateLimiter(capacity=2, refill_per_second=0.5, database=Database(str(tmp_path / 'r.db'))),
+], ids=['memory', 'sqlite'])
+def test_token_bucket_allows_burst_then_refills(build, clock, tmp_path):
+    limiter = build(tmp_path)
+    assert limiter.acquire('user') == 0
+    assert limiter.acquire('user') == 0
+    assert limiter.acquire('user') == pytest.approx(2.0)
+    assert limiter.acquire('other') == 0
+
+    clock.now += 1
+    assert limiter.acquire('user') == pytest.approx(1.0)
+    clock.now += 1
+    assert limiter.acquire('user') == 0
+
+    clock.now += 100
+    assert [limiter.acquire('user') for _ in range(3)] == [0, 0, pytest.approx(2.0)]
+
+
+def test_admission_controller_always_admits_a_single_job():
+    controller = AdmissionController(max_inflight_bytes=10, max_heavy_jobs=2)
+    assert controller.admit(100)
+    assert not controller.admit(1)
+    controller.release(100)
+    assert controller.admit(5)
+    assert controller.admit(5)
+    assert not controller.admit(0)
+
+
+def test_admission_ticket_release_is_idempotent():
+    controller = AdmissionController(max_inflight_bytes=100, max_heavy_jobs=2)
+    controller.admit(10)
+    ticket = AdmissionTicket(controller, 10)
+    ticket.release()
+    ticket.release()
+    assert (controller.heavy_jobs, controller.inflight_bytes) == (0, 0)
+
+
+def test_admission_ticket_wrap_holds_the_slot_until_the_body_ends():
+    controller = AdmissionController(max_inflight_bytes=100, max_heavy_jobs=2)
+    controller.admit(10)
+    ticket = AdmissionTicket(controller, 10)
+    body = ticket.wrap(iter([b'a', b'b']))
+    assert ticket.deferred
+    assert next(body) == b'a'
+    assert controller.heavy_jobs == 1
+    assert list(body) == [b'b']
+    assert (controller.heavy_jobs, controller.inflight_bytes) == (0, 0)
+
+
+def test_admission_ticket_wrap_releases_bodies_that_never_start():
+    controller = AdmissionController(max_inflight_bytes=100, max_heavy_jobs=2)
+    controller.admit(10)
+    body = AdmissionTicket(controller, 10).wrap(iter([b'a']))
+    del body
+    gc.collect()
+    assert (controller.heavy_jobs, controller.inflight_bytes) == (0, 0)
+
+
+def build_request(body: bytes, headers: dict[str, str]) -> Request:
+    chunks = [body[:7], body[7:]]
+
+    async def receive():
+        chunk = chunks.pop(0) if chunks else b''
+        return {'type': 'http.request', 'body': chunk, 'more_body': bool(chunks)}
+
+    scope = {'type': 'http', 'method': 'POST', 'path': '/', 'query_string': b'',
+             'headers': [(k.lower().encode(), v.encode()) for k, v in headers.items()]}
+    return Request(scope, receive)
+
+
+async def run_admission(request: Request, controller: AdmissionController) -> list[tuple[int, int]]:
+    seen = []
+    dependency = admission_control(request)
+    await dependency.__anext__()
+    seen.append((controller.heavy_jobs, controller.inflight_bytes))
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+    seen.append((controller.heavy_jobs, controller.inflight_bytes))
+    return seen
+
+
+def test_admission_control_counts_chunked_uploads(monkeypatch):
+    controller = AdmissionController(max_inflight_bytes=1000, max_heavy_jobs=1)
+    monkeypatch.setattr(rate_limit, 'admission_controller', controller)
+    boundary = 'b0undary'
+    body = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="a.xlsx"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n').encode() + b'x' * 300 + f'\r\n--{boundary}--\r\n'.encode()
+    request = build_request(body, {'content-type': f'multipart/form-data; boundary={boundary}'})
+
+    async def scenario():
+        await request.form()
+        return await run_admission(request, controller)
+
+    assert asyncio.run(scenario()) == [(1, 300), (0, 0)]
+
+
+def test_admission_control_rejects_when_full(monkeypatch):
+    controller = AdmissionController(max_inflight_bytes=1000, max_heavy_jobs=1)
+    controller.admit(1)
+    monkeypatch.setattr(rate_limit, 'admission_controller', controller)
+    request = build_request(b'{}', {'content-type': 'application/json', 'content-length': '2'})
+
+    with pytest.raises(ServiceOverloadedException):
+        asyncio.run(admission_control(request).__anext__())
@@ -0,0 +1,60 @@
+import os
+import threading
+
+import pytest
+
+from app.entities.report import ReportInfoOutDTO
+from app.services.render_reports_pdf_pool_service import RenderReportsPdfPoolService
+
+
+class KillsWorker:
+    # Ao ser desserializado no worker, encerra o processo e quebra o pool
+    def __reduce__(self):
+        return os._exit, (1,)
+
+
+def report() -> ReportInfoOutDTO:
+    return ReportInfoOutDTO(title='Relatório', sections=[])
+
+
+@pytest.fixture
+def pool():
+    service = RenderReportsPdfPoolService(max_workers=2, chunksize=2)
+    yield service
+    service.shutdown()
+
+
+def rendered(pdfs) -> list[bool]:
+    return [pdf is not None and pdf.startswith(b'%PDF') for pdf in pdfs]
+
+
+def test_a_failed_render_only_affects_its_report(pool):
+    assert rendered(pool.execute([report(), 'não é um relatório', report()])) == [True, False, True]
+
+
+def test_broken_pool_is_replaced_for_later_calls(pool):
+    # Quando o worker morre, o ProcessPoolExecutor quebra todas as futures em voo; o primeiro chunk só sai
+    # renderizado se terminar antes disso, então apenas o chunk do worker morto tem resultado garantido
+    pdfs = rendered(pool.execute([report(), report(), KillsWorker(), report()]))
+    assert len(pdfs) == 4
+    assert pdfs[2:] == [False, False]
+    assert rendered(pool.execute([report(), report()])) == [True, True]
+
+
+def test_failures_in_one_stream_do_not_touch_another(pool):
+    results = {}
+
+    def run(name, reports):
+        results[name] = rendered(pool.execute(reports))
+
+    threads = [
+        threading.Thread(target=run, args=('failing', [report(), 'inválido'] * 10)),
+        threading.Thread(target=run, args=('healthy', [report()] * 20)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results['failing'] == [True, False] * 10
+    assert results['healthy'] == [True] * 20
@@ -0,0 +1,37 @@
+import math
+
+import numpy as np
+import orjson
+import pytest
+from pydantic import ValidationError
+
+from app.entities.report import Metric, ReportInfoOutDTO, metric, report_info, section
+from app.utils.responses import ReportJSONResponse
+
+
+@pytest.mark.parametrize('value', [
+    'Total: 3 ( 12.50%)', 7, 2.5, True, np.int64(5), np.int32(3), np.float64(2.5), np.float32(1.5), np.bool_(True),
+    np.str_('SIM'),
+])
+def test_metric_coerces_like_the_model(value):
+    coerced = metric(metric='m', value=value)['value']
+
+    expected = Metric(metric='m', value=value).value
+    assert coerced == expected
+    assert type(coerced) is type(expected)
+
+
+def test_metric_keeps_nan_and_rejects_what_the_model_rejects():
+    assert math.isnan(metric(metric='m', value=float('nan'))['value'])
+    with pytest.raises(ValidationError):
+        metric(metric='m', value=None)
+
+
+def test_plain_report_serializes_like_the_model():
+    report = report_info(title='t', sections=[
+        section(name='s', metrics=[metric(metric='a', value=np.int64(5)), metric(metric='b', value='x')])
+    ])
+    dto = ReportInfoOutDTO.model_validate(report)
+
+    assert ReportJSONResponse(report).body == ReportJSONResponse(dto).body
+    assert orjson.loads(ReportJSONResponse(report).body)['sections'][0]['metrics'][0]['value'] == 5.0